@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+MultiLanguage AI Text Summarizer
+Batch entry point for offline summarization of directories and JSONL corpora
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to Python path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.cli.batch import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+JSON Serialization Benchmark
+Compares the old dict-merge + jsonable_encoder path with direct ORJSONResponse encoding
+
+Run from the repository root:
+    python benchmarks/json_serialization.py
+"""
+
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+HINDI_SENTENCE = "भारत सरकार ने आज नई शिक्षा नीति के तहत ग्रामीण क्षेत्रों में डिजिटल कक्षाओं के विस्तार की घोषणा की"
+
+
+def make_result(sentences: int) -> dict:
+    """Build a summary payload shaped like SummarizerService output"""
+    summary = "। ".join([HINDI_SENTENCE] * sentences) + "।"
+    return {
+        "summary": summary,
+        "original_length": sentences * 60,
+        "summary_length": len(summary.split()),
+        "compression_ratio": 0.18,
+        "processing_time": 0.01,
+        "title": "शिक्षा नीति पर नई घोषणा",
+        "url": "https://example.com/news/education-policy",
+    }
+
+
+def old_path(result: dict) -> bytes:
+    """Previous handler behaviour: merged dict through jsonable_encoder"""
+    payload = {"success": True, **result, "result_id": "Xb3k9QpL2aE"}
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def new_path(result: dict) -> bytes:
+    """Current handler behaviour: in-place update, encoded once by orjson"""
+    result["success"] = True
+    result["result_id"] = "Xb3k9QpL2aE"
+    return ORJSONResponse(result).body
+
+
+def bench(func, sentences: int, iterations: int) -> float:
+    """Return microseconds per call"""
+    results = [make_result(sentences) for _ in range(iterations)]
+    start = time.perf_counter()
+    for result in results:
+        func(result)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    print(f"{'payload':>16} {'old (us)':>10} {'new (us)':>10} {'speedup':>8}")
+    for sentences, iterations in [(3, 20000), (20, 10000), (200, 2000)]:
+        old = bench(old_path, sentences, iterations)
+        new = bench(new_path, sentences, iterations)
+        size = len(new_path(make_result(sentences)))
+        print(f"{size:>10} bytes {old:>10.1f} {new:>10.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
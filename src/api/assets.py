@@ -0,0 +1,134 @@
+"""
+Static Asset and Page Caching
+Fingerprinted, precompressed static assets, pre-rendered pages and API compression
+"""
+
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Formats that are already compressed and gain nothing from gzip/brotli
+PRECOMPRESSED_SUFFIXES = {".woff", ".woff2", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".zip", ".gz", ".br"}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+class CachedBody:
+    """A response body kept in identity, gzip and brotli encodings"""
+
+    __slots__ = ("identity", "gzip", "br", "etag", "media_type")
+
+    def __init__(self, body: bytes, media_type: str, compress: bool = True):
+        self.identity = body
+        self.media_type = media_type
+        self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        self.gzip: Optional[bytes] = None
+        self.br: Optional[bytes] = None
+
+        if compress and body:
+            gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gzipped) < len(body):
+                self.gzip = gzipped
+            if BROTLI_AVAILABLE:
+                brotlied = brotli.compress(body, quality=11)
+                if len(brotlied) < len(body):
+                    self.br = brotlied
+
+    def _negotiate(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Pick the smallest encoding the client accepts"""
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+        if self.br is not None and "br" in accepted:
+            return self.br, "br"
+        if self.gzip is not None and "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.identity, None
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        """Build a response, answering conditional requests with 304"""
+        headers = {"ETag": self.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=headers)
+
+        body, encoding = self._negotiate(request.headers.get("accept-encoding", ""))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class AssetRegistry:
+    def __init__(self, mount_path: str = "/assets"):
+        self.mount_path = mount_path.rstrip("/")
+        self._assets: Dict[str, CachedBody] = {}
+        self._urls: Dict[str, str] = {}
+
+    def register_directory(self, directory: Path, prefix: str = ""):
+        """Fingerprint and precompress every file in a directory tree"""
+        if not directory.is_dir():
+            return
+
+        for path in sorted(directory.rglob("*")):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+
+            logical_name = prefix + path.relative_to(directory).as_posix()
+            body = path.read_bytes()
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            cached = CachedBody(body, media_type, compress=path.suffix.lower() not in PRECOMPRESSED_SUFFIXES)
+
+            # Content hash in the file name lets browsers cache forever
+            fingerprint = cached.etag.strip('"')[:12]
+            stem, dot, suffix = logical_name.rpartition(".")
+            fingerprinted = f"{stem}.{fingerprint}.{suffix}" if dot else f"{logical_name}.{fingerprint}"
+
+            self._assets[fingerprinted] = cached
+            self._urls[logical_name] = f"{self.mount_path}/{fingerprinted}"
+
+    def url_for(self, name: str) -> str:
+        """Fingerprinted URL for an asset, falling back to the plain static mount"""
+        return self._urls.get(name, f"/static/{name}")
+
+    def get(self, fingerprinted_name: str) -> Optional[CachedBody]:
+        """Look up an asset by its fingerprinted name"""
+        return self._assets.get(fingerprinted_name)
+
+
+class PageCache:
+    """Pre-rendered HTML pages keyed by template name and variant"""
+
+    def __init__(self):
+        self._pages: Dict[Tuple[str, str], CachedBody] = {}
+
+    def put(self, template_name: str, variant: str, html: str):
+        self._pages[(template_name, variant)] = CachedBody(html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def get(self, template_name: str, variant: str = "") -> Optional[CachedBody]:
+        return self._pages.get((template_name, variant))
+
+
+class PathGZipMiddleware:
+    """Gzip dynamic responses only, so precompressed assets are never compressed twice"""
+
+    def __init__(self, app, prefixes: Tuple[str, ...], minimum_size: int = 1000):
+        self.app = app
+        self.prefixes = prefixes
+        self.gzip_app = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.prefixes):
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -4,11 +4,12 @@ Modern, async API with support for Text, URL, PDF, and YouTube summarization
 """
 
 from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, Response, ORJSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
-from typing import Literal
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, Dict, Any, List
+from urllib.parse import quote
 import os
 import tempfile
 import shutil
@@ -16,6 +17,14 @@ from pathlib import Path
 
 # Import our modules
 from src.core.summarizer import SummarizerService
+from src.core.result_store import ResultStore
+from src.core.exporters import EXPORT_FORMATS, export_filename
+from src.core.profiling import Profiler
+from src.api.assets import (
+    AssetRegistry, PageCache, PathGZipMiddleware,
+    IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+)
+from src.api.profiling import ProfilingMiddleware
 from src.utils.pdf_utils import PDFProcessor
 from src.utils.youtube_utils import YouTubeProcessor
 
@@ -23,13 +32,15 @@ from src.utils.youtube_utils import YouTubeProcessor
 app = FastAPI(
     title="MultiLanguage AI Text Summarizer",
     description="Professional AI-powered text summarization in Hindi and English",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Define base directory for robust path handling
 BASE_DIR = Path(__file__).parent.parent.parent
 TEMPLATES_DIR = BASE_DIR / "templates"
 STATIC_DIR = BASE_DIR / "static"
+FONTS_DIR = BASE_DIR / "fonts"
 
 # Ensure directories exist
 TEMPLATES_DIR.mkdir(exist_ok=True)
@@ -39,35 +50,194 @@ STATIC_DIR.mkdir(exist_ok=True)
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
+# Fingerprinted, precompressed assets and pre-rendered pages
+asset_registry = AssetRegistry(mount_path="/assets")
+page_cache = PageCache()
+templates.env.globals["asset_url"] = asset_registry.url_for
+
+# Compress summarize responses and result pages (assets are precompressed)
+app.add_middleware(PathGZipMiddleware, prefixes=("/api/summarize", "/result"))
+
+# Pages that only vary by language are rendered once at startup
+PRERENDERED_LANGUAGES = ("hindi", "english")
+
 # Initialize services
 summarizer_service = SummarizerService()
 pdf_processor = PDFProcessor()
-youtube_processor = YouTubeProcessor()
+youtube_processor = YouTubeProcessor(summarizer=summarizer_service)
+result_store = ResultStore()
+# Admin-only profiling; disabled unless SUMMARIZER_ADMIN_TOKEN is set
+profiler = Profiler()
+
+app.add_middleware(ProfilingMiddleware, profiler=profiler)
 
 # Pydantic models for request validation
 class SummarizeRequest(BaseModel):
     text: str
     language: Literal["hindi", "english"] = "hindi"
     summary_length: Literal["short", "medium", "long", "auto"] = "auto"
+    scorer: Literal["heuristic", "semantic"] = "heuristic"
+    method: Literal["extractive", "abstractive"] = "extractive"
+    quality: Literal["fast", "quality"] = "fast"
+    # Explicit budget; overrides summary_length when given
+    max_words: Optional[int] = Field(None, ge=1, le=2000)
+    ratio: Optional[float] = Field(None, gt=0, le=1)
+    # Stable ID for documents that are re-submitted after edits
+    document_id: Optional[str] = None
 
 class SummarizeURLRequest(BaseModel):
     url: str
     language: Literal["hindi", "english"] = "hindi"
     summary_length: Literal["short", "medium", "long", "auto"] = "auto"
+    scorer: Literal["heuristic", "semantic"] = "heuristic"
+    method: Literal["extractive", "abstractive"] = "extractive"
+    quality: Literal["fast", "quality"] = "fast"
+    # Explicit budget; overrides summary_length when given
+    max_words: Optional[int] = Field(None, ge=1, le=2000)
+    ratio: Optional[float] = Field(None, gt=0, le=1)
 
 class SummarizePDFRequest(BaseModel):
     language: Literal["hindi", "english"] = "hindi"
     summary_length: Literal["short", "medium", "long", "auto"] = "auto"
+    scorer: Literal["heuristic", "semantic"] = "heuristic"
+    method: Literal["extractive", "abstractive"] = "extractive"
+    quality: Literal["fast", "quality"] = "fast"
+    # Explicit budget; overrides summary_length when given
+    max_words: Optional[int] = Field(None, ge=1, le=2000)
+    ratio: Optional[float] = Field(None, gt=0, le=1)
 
 class SummarizeYouTubeRequest(BaseModel):
     url: str
     language: Literal["hindi", "english"] = "hindi"
     summary_length: Literal["short", "medium", "long", "auto"] = "auto"
+    scorer: Literal["heuristic", "semantic"] = "heuristic"
+    method: Literal["extractive", "abstractive"] = "extractive"
+    quality: Literal["fast", "quality"] = "fast"
+    # Explicit budget; overrides summary_length when given
+    max_words: Optional[int] = Field(None, ge=1, le=2000)
+    ratio: Optional[float] = Field(None, gt=0, le=1)
+
+# Pydantic models for API responses
+class SummaryResponse(BaseModel):
+    success: bool = True
+    summary: str
+    original_length: int
+    summary_length: int
+    compression_ratio: float
+    processing_time: float
+    language: str
+    result_id: str
+    title: Optional[str] = None
+    url: Optional[str] = None
+    filename: Optional[str] = None
+    file_type: Optional[str] = None
+    video_id: Optional[str] = None
+    video_url: Optional[str] = None
+    reused_sentences: Optional[int] = None
+    rescored_sentences: Optional[int] = None
+    scorer: Optional[str] = None
+    method: Optional[str] = None
+    model: Optional[str] = None
+    target_words: Optional[int] = None
+    detected_language: Optional[str] = None
+    script: Optional[str] = None
+    near_duplicate_of: Optional[str] = None
+    similarity: Optional[float] = None
+
+class BulkExportItem(BaseModel):
+    result_id: Optional[str] = None
+    summary: Optional[str] = None
+    title: Optional[str] = None
+    language: Optional[str] = None
+
+class BulkExportRequest(BaseModel):
+    items: List[BulkExportItem]
+    formats: List[Literal["pdf", "word", "markdown"]] = ["pdf", "word", "markdown"]
+
+MAX_BULK_EXPORT_ITEMS = 1000
+
+# Result storage helpers
+def _store_result(result: Dict[str, Any], language: str) -> ORJSONResponse:
+    """Keep a summarization result server-side and encode it once for the response"""
+    # SummaryResponse documents the payload; returning the response directly
+    # skips FastAPI's validation and jsonable_encoder pass over the dict
+    result["success"] = True
+    # The summarizer reports the language it actually processed the text as
+    result.setdefault("language", language)
+    result["result_id"] = result_store.put(result)
+    return ORJSONResponse(result)
+
+def _resolve_export_input(
+    result_id: Optional[str],
+    summary: Optional[str],
+    title: Optional[str],
+    language: Optional[str]
+) -> tuple[str, str, str]:
+    """Resolve export input from a stored result ID or explicit form fields"""
+    if result_id:
+        entry = result_store.get(result_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Result not found or expired")
+        return (
+            entry.data.get("summary", ""),
+            title or entry.data.get("title") or "Summary",
+            language or entry.data.get("language", "hindi")
+        )
+    if not summary or not summary.strip():
+        raise HTTPException(status_code=400, detail="Summary cannot be empty")
+    return summary, title or "Summary", language or "hindi"
+
+def _attachment(content: bytes, export_format: str, title: str) -> Response:
+    """Rendered export as a download, without a temp file on disk"""
+    filename = export_filename(title, export_format)
+    quoted = quote(filename)
+    disposition = (
+        f'attachment; filename="{filename}"' if quoted == filename
+        else f"attachment; filename*=utf-8''{quoted}"
+    )
+    return Response(
+        content,
+        media_type=EXPORT_FORMATS[export_format].media_type,
+        headers={"Content-Disposition": disposition}
+    )
+
+# Startup
+@app.on_event("startup")
+async def prepare_static_content():
+    """Fingerprint static assets, compile templates and pre-render static pages"""
+    asset_registry.register_directory(STATIC_DIR)
+    asset_registry.register_directory(FONTS_DIR, prefix="fonts/")
+    
+    # Compile the per-request template up front
+    templates.get_template("result.html")
+    
+    page_cache.put("index.html", "", templates.get_template("index.html").render({
+        "title": "MultiLanguage AI Text Summarizer"
+    }))
+    for language in PRERENDERED_LANGUAGES:
+        page_cache.put("summarizer.html", language, templates.get_template("summarizer.html").render({
+            "language": language,
+            "title": "Summarizer Dashboard"
+        }))
+    
+    if profiler.enabled and os.environ.get("SUMMARIZER_CONTINUOUS_PROFILING") == "1":
+        profiler.start_continuous()
+
+@app.on_event("shutdown")
+async def persist_state():
+    """Persist summarizer indexes across restarts and stop worker pools"""
+    summarizer_service.save_state()
+    summarizer_service.export_pool.shutdown()
+    pdf_processor.ocr_processor.shutdown()
+    profiler.stop_continuous()
 
 # Web Routes
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Language selection page"""
+    page = page_cache.get("index.html")
+    if page is not None:
+        return page.response(request, REVALIDATE_CACHE_CONTROL)
     return templates.TemplateResponse("index.html", {
         "request": request,
         "title": "MultiLanguage AI Text Summarizer"
@@ -76,59 +246,171 @@ async def home(request: Request):
 @app.get("/summarizer", response_class=HTMLResponse)
 async def summarizer_dashboard(request: Request, language: str = "hindi"):
     """Main summarizer dashboard"""
+    page = page_cache.get("summarizer.html", language)
+    if page is not None:
+        return page.response(request, REVALIDATE_CACHE_CONTROL)
     return templates.TemplateResponse("summarizer.html", {
         "request": request,
         "language": language,
         "title": "Summarizer Dashboard"
     })
 
+@app.get("/assets/{asset_path:path}")
+async def fingerprinted_asset(request: Request, asset_path: str):
+    """Serve a fingerprinted static asset with immutable caching"""
+    asset = asset_registry.get(asset_path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return asset.response(request, IMMUTABLE_CACHE_CONTROL)
+
 @app.get("/result", response_class=HTMLResponse)
 async def result_page(request: Request, summary: str, title: str = "Summary", language: str = "hindi"):
-    """Results display page"""
+    """Legacy results page for links that still carry the summary in the query string"""
     return templates.TemplateResponse("result.html", {
         "request": request,
         "summary": summary,
         "title": title,
-        "language": language
+        "language": language,
+        "result_id": ""
     })
 
+@app.get("/result/{result_id}", response_class=HTMLResponse)
+async def stored_result_page(request: Request, result_id: str):
+    """Results display page backed by server-side result storage"""
+    entry = result_store.get(result_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Result not found or expired")
+    
+    headers = {"ETag": entry.etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    
+    # Render once per stored result; the result never changes afterwards
+    if entry.html is None:
+        entry.html = templates.get_template("result.html").render({
+            "request": request,
+            "summary": entry.data.get("summary", ""),
+            "title": entry.data.get("title") or "Summary",
+            "language": entry.data.get("language", "hindi"),
+            "result_id": result_id
+        })
+    return HTMLResponse(entry.html, headers=headers)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "MultiLanguage AI Text Summarizer is running!"}
 
+@app.get("/api/metrics")
+async def metrics():
+    """Cache, index and result store statistics"""
+    return {
+        **summarizer_service.get_stats(),
+        "stored_results": len(result_store),
+        "youtube_requests": youtube_processor.flights.stats()
+    }
+
+# Admin profiling endpoints
+def _require_admin(request: Request):
+    """Admin endpoints do not exist without a token and reject any other token"""
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiler.authorized(request.headers.get("x-admin-token")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/api/admin/profiles")
+async def list_profiles(request: Request):
+    """Recent request profiles"""
+    _require_admin(request)
+    return [
+        {
+            "profile_id": profile_id,
+            "label": profile.report["label"],
+            "wall_seconds": profile.report["wall_seconds"],
+            "peak_mb": profile.report["memory"]["peak_mb"]
+        }
+        for profile_id, profile in reversed(profiler.reports.items())
+    ]
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: str, format: Literal["json", "folded"] = "json"):
+    """One request profile; format=folded returns stacks for flamegraph.pl or speedscope"""
+    _require_admin(request)
+    report = profiler.get_report(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found or still running")
+    if format == "folded":
+        return PlainTextResponse(report["cpu"]["folded"])
+    return report
+
+@app.get("/api/admin/profiling/continuous")
+async def continuous_profile(request: Request, format: Literal["json", "folded"] = "json", limit: int = 20):
+    """Hot stacks aggregated by the continuous low-rate sampler"""
+    _require_admin(request)
+    if format == "folded":
+        return PlainTextResponse(profiler.continuous.folded())
+    return profiler.continuous_stats(limit)
+
+@app.post("/api/admin/profiling/continuous/{action}")
+async def control_continuous_profile(request: Request, action: Literal["start", "stop", "reset"]):
+    """Start, stop or clear the continuous sampler"""
+    _require_admin(request)
+    if action == "start":
+        profiler.start_continuous()
+    elif action == "stop":
+        profiler.stop_continuous()
+    else:
+        profiler.continuous.reset()
+    return profiler.continuous_stats(limit=0)
+
 # API Endpoints
-@app.post("/api/summarize/text")
+@app.post("/api/summarize/text", response_model=SummaryResponse)
 async def summarize_text(request: SummarizeRequest):
     """Summarize raw text"""
     try:
         result = await summarizer_service.summarize_text(
             text=request.text,
             language=request.language,
-            summary_length=request.summary_length
+            summary_length=request.summary_length,
+            document_key=f"doc:{request.document_id}" if request.document_id else None,
+            scorer=request.scorer,
+            method=request.method,
+            quality=request.quality,
+            max_words=request.max_words,
+            ratio=request.ratio
         )
-        return {"success": True, **result}
+        return _store_result(result, request.language)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/summarize/url")
+@app.post("/api/summarize/url", response_model=SummaryResponse)
 async def summarize_url(request: SummarizeURLRequest):
     """Extract and summarize content from URL"""
     try:
         result = await summarizer_service.summarize_url(
             url=request.url,
             language=request.language,
-            summary_length=request.summary_length
+            summary_length=request.summary_length,
+            scorer=request.scorer,
+            method=request.method,
+            quality=request.quality,
+            max_words=request.max_words,
+            ratio=request.ratio
         )
-        return {"success": True, **result}
+        return _store_result(result, request.language)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/summarize/pdf")
+@app.post("/api/summarize/pdf", response_model=SummaryResponse)
 async def summarize_pdf(
     file: UploadFile = File(...),
     language: str = Form("hindi"),
-    summary_length: str = Form("auto")
+    summary_length: str = Form("auto"),
+    scorer: str = Form("heuristic"),
+    method: str = Form("extractive"),
+    quality: str = Form("fast"),
+    max_words: Optional[int] = Form(None, ge=1, le=2000),
+    ratio: Optional[float] = Form(None, gt=0, le=1)
 ):
     """Upload and summarize PDF file"""
     try:
@@ -149,14 +431,19 @@ async def summarize_pdf(
             result = await summarizer_service.summarize_text(
                 text=text,
                 language=language,
-                summary_length=summary_length
+                summary_length=summary_length,
+                scorer=scorer,
+                method=method,
+                quality=quality,
+                max_words=max_words,
+                ratio=ratio
             )
             
             # Add file information
             result["filename"] = file.filename
             result["file_type"] = "PDF"
             
-            return {"success": True, **result}
+            return _store_result(result, language)
             
         finally:
             # Clean up temporary file
@@ -165,44 +452,41 @@ async def summarize_pdf(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/summarize/youtube")
+@app.post("/api/summarize/youtube", response_model=SummaryResponse)
 async def summarize_youtube(request: SummarizeYouTubeRequest):
     """Extract transcript and summarize YouTube video"""
     try:
         result = await youtube_processor.summarize_video(
             url=request.url,
             language=request.language,
-            summary_length=request.summary_length
+            summary_length=request.summary_length,
+            scorer=request.scorer,
+            method=request.method,
+            quality=request.quality,
+            max_words=request.max_words,
+            ratio=request.ratio
         )
-        return {"success": True, **result}
+        return _store_result(result, request.language)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/export/pdf")
 async def export_pdf(
-    summary: str = Form(...),
-    title: str = Form("Summary"),
-    language: str = Form("hindi")
+    result_id: Optional[str] = Form(None),
+    summary: Optional[str] = Form(None),
+    title: Optional[str] = Form(None),
+    language: Optional[str] = Form(None)
 ):
     """Export summary as PDF"""
     try:
-        if not summary or not summary.strip():
-            raise HTTPException(status_code=400, detail="Summary cannot be empty")
+        summary, title, language = _resolve_export_input(result_id, summary, title, language)
         
-        pdf_path = await summarizer_service.export_pdf(
+        content = await summarizer_service.export_pdf(
             summary=summary,
             title=title,
             language=language
         )
-        
-        if not os.path.exists(pdf_path):
-            raise HTTPException(status_code=500, detail="Failed to generate PDF file")
-        
-        return FileResponse(
-            pdf_path,
-            media_type="application/pdf",
-            filename=f"{title.replace(' ', '_')}.pdf"
-        )
+        return _attachment(content, "pdf", title)
     except HTTPException:
         raise
     except Exception as e:
@@ -211,46 +495,77 @@ async def export_pdf(
 
 @app.post("/api/export/word")
 async def export_word(
-    summary: str = Form(...),
-    title: str = Form("Summary"),
-    language: str = Form("hindi")
+    result_id: Optional[str] = Form(None),
+    summary: Optional[str] = Form(None),
+    title: Optional[str] = Form(None),
+    language: Optional[str] = Form(None)
 ):
     """Export summary as Word document"""
     try:
-        doc_path = await summarizer_service.export_word(
+        summary, title, language = _resolve_export_input(result_id, summary, title, language)
+        
+        content = await summarizer_service.export_word(
             summary=summary,
             title=title,
             language=language
         )
-        return FileResponse(
-            doc_path,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            filename=f"{title.replace(' ', '_')}.docx"
-        )
+        return _attachment(content, "word", title)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/export/markdown")
 async def export_markdown(
-    summary: str = Form(...),
-    title: str = Form("Summary"),
-    language: str = Form("hindi")
+    result_id: Optional[str] = Form(None),
+    summary: Optional[str] = Form(None),
+    title: Optional[str] = Form(None),
+    language: Optional[str] = Form(None)
 ):
     """Export summary as Markdown"""
     try:
-        md_path = await summarizer_service.export_markdown(
+        summary, title, language = _resolve_export_input(result_id, summary, title, language)
+        
+        content = await summarizer_service.export_markdown(
             summary=summary,
             title=title,
             language=language
         )
-        return FileResponse(
-            md_path,
-            media_type="text/markdown",
-            filename=f"{title.replace(' ', '_')}.md"
-        )
+        return _attachment(content, "markdown", title)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/export/bulk")
+async def export_bulk(request: BulkExportRequest):
+    """Export one or many summaries in several formats as a single streamed ZIP"""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    if len(request.items) > MAX_BULK_EXPORT_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_EXPORT_ITEMS} items per request")
+    if not request.formats:
+        raise HTTPException(status_code=400, detail="At least one format is required")
+    
+    # Resolve everything before the first byte is sent, while errors can still be a 4xx
+    resolved = [
+        _resolve_export_input(item.result_id, item.summary, item.title, item.language)
+        for item in request.items
+    ]
+    formats = list(dict.fromkeys(request.formats))
+    
+    def jobs():
+        for index, (summary, title, language) in enumerate(resolved, start=1):
+            for export_format in formats:
+                name = f"{index:03d}_{export_filename(title, export_format)}"
+                yield name, export_format, summary, title, language
+    
+    return StreamingResponse(
+        summarizer_service.export_pool.stream_zip(jobs()),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="summaries.zip"'}
+    )
+
 # For Vercel deployment
 app = app
 
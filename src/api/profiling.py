@@ -0,0 +1,56 @@
+"""
+Profiling Middleware
+Pure ASGI wrapper that runs admin-flagged requests under the request profiler
+"""
+
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from src.core.profiling import Profiler, ProfilerBusy, profiled_request_scope
+
+
+class ProfilingMiddleware:
+    """Profile a request when an admin asks for it with X-Profile: 1 or ?profile=1
+
+    Requests pass through untouched unless an admin token is configured and the flag is present.
+    """
+
+    def __init__(self, app, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    def _flagged(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"x-profile" and value == b"1":
+                return True
+        query = scope.get("query_string", b"")
+        return b"profile=" in query and ("profile", "1") in parse_qsl(query.decode("latin-1"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.enabled or not self._flagged(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self.profiler.authorized(Headers(scope=scope).get("x-admin-token")):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profile = self.profiler.start_request(f"{scope['method']} {scope['path']}")
+        except ProfilerBusy as e:
+            await JSONResponse({"detail": str(e)}, status_code=409)(scope, receive, send)
+            return
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile.profile_id)
+            await send(message)
+
+        # The app returns only after the whole body is sent, so streamed bulk exports are covered
+        try:
+            with profiled_request_scope():
+                await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.finish_request(profile)
@@ -0,0 +1,256 @@
+"""
+Batch Summarization CLI
+Offline summarization of PDF/text directories and JSONL corpora without the web server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+TEXT_SUFFIXES = {".txt", ".md"}
+PDF_SUFFIXES = {".pdf"}
+JSONL_ID_FIELDS = ("id", "request_id", "document_id")
+JSONL_TEXT_FIELDS = ("text", "body", "content")
+# Language values accepted in JSONL records, mapped to the summarizer's names
+LANGUAGE_ALIASES = {
+    "hindi": "hindi", "hi": "hindi", "hin": "hindi",
+    "english": "english", "en": "english", "eng": "english",
+}
+
+# Per-process state, created once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def iter_directory_items(directory: Path) -> Iterator[Dict[str, Any]]:
+    """Yield PDF and text files under a directory as batch items"""
+    for path in sorted(directory.rglob("*")):
+        suffix = path.suffix.lower()
+        if path.is_file() and suffix in TEXT_SUFFIXES | PDF_SUFFIXES:
+            yield {
+                "id": path.relative_to(directory).as_posix(),
+                "path": str(path),
+                "type": "pdf" if suffix in PDF_SUFFIXES else "text",
+                "title": path.stem
+            }
+
+
+def iter_jsonl_items(jsonl_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield records of a JSONL corpus as batch items; unreadable lines become items carrying an error"""
+    with open(jsonl_path, "rb") as f:
+        for line_number, raw_line in enumerate(f, start=1):
+            if not raw_line.strip():
+                continue
+            try:
+                record = json.loads(raw_line.decode("utf-8"))
+                if not isinstance(record, dict):
+                    raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+            except ValueError as e:
+                # One bad line must not stop the corpus (UnicodeDecodeError and JSONDecodeError are ValueErrors)
+                item_id = f"line-{line_number}"
+                yield {"id": item_id, "type": "text", "title": item_id, "error": f"Invalid JSONL record: {e}"}
+                continue
+            item_id = next((str(record[k]) for k in JSONL_ID_FIELDS if record.get(k)), f"line-{line_number}")
+            text = next((record[k] for k in JSONL_TEXT_FIELDS if record.get(k)), "")
+            yield {
+                "id": item_id,
+                "text": text,
+                "type": "text",
+                "title": record.get("title") or item_id,
+                "language": record.get("language")
+            }
+
+
+def resolve_language(value: Optional[Any]) -> Optional[str]:
+    """Summarizer language for a record's language field; None if missing, ValueError if unsupported"""
+    if value is None or value == "":
+        return None
+    language = LANGUAGE_ALIASES.get(str(value).strip().lower())
+    if language is None:
+        raise ValueError(f"Unsupported language {value!r}; expected one of {sorted(set(LANGUAGE_ALIASES))}")
+    return language
+
+
+def load_checkpoint(checkpoint_path: Path) -> Dict[str, str]:
+    """Terminal status ("ok" or "error") of each item finished by an earlier run"""
+    statuses: Dict[str, str] = {}
+    if not checkpoint_path.exists():
+        return statuses
+    with open(checkpoint_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+            item_id, _, status = line.rpartition("\t")
+            if status not in ("ok", "error"):
+                # Lines written before statuses were recorded only held successful IDs
+                item_id, status = line, "ok"
+            statuses[item_id] = status
+    return statuses
+
+
+def _init_worker(language: str, summary_length: str):
+    """Create one summarizer and PDF processor per worker process"""
+    from src.core.summarizer import SummarizerService
+    from src.utils.pdf_utils import PDFProcessor
+    from src.utils.ocr_utils import OCRProcessor
+
+    _worker_state["summarizer"] = SummarizerService()
+    # Parallelism comes from the batch pool, so each worker OCRs serially
+    _worker_state["pdf_processor"] = PDFProcessor(ocr_processor=OCRProcessor(max_workers=1))
+    _worker_state["loop"] = asyncio.new_event_loop()
+    _worker_state["language"] = language
+    _worker_state["summary_length"] = summary_length
+
+
+def _process_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize one batch item inside a worker process"""
+    loop = _worker_state["loop"]
+    summarizer = _worker_state["summarizer"]
+    try:
+        language = resolve_language(item.get("language")) or _worker_state["language"]
+        if item["type"] == "pdf":
+            text = loop.run_until_complete(_worker_state["pdf_processor"].extract_text(item["path"]))
+        elif "path" in item:
+            text = Path(item["path"]).read_text(encoding="utf-8")
+        else:
+            text = item["text"]
+
+        result = loop.run_until_complete(summarizer.summarize_text(
+            text=text,
+            language=language,
+            summary_length=_worker_state["summary_length"],
+            document_key=f"batch:{item['id']}"
+        ))
+        return {"id": item["id"], "status": "ok", "title": item.get("title"), "language": language, **result}
+    except Exception as e:
+        return {"id": item["id"], "status": "error", "title": item.get("title"), "error": str(e)}
+
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    checkpoint_path: Path,
+    language: str = "hindi",
+    summary_length: str = "auto",
+    workers: Optional[int] = None,
+    resume: bool = True,
+    retry_errors: bool = False
+) -> Dict[str, Any]:
+    """Summarize every item of a directory or JSONL file and stream results to JSONL"""
+    if input_path.is_dir():
+        items = iter_directory_items(input_path)
+    elif input_path.suffix.lower() == ".jsonl":
+        items = iter_jsonl_items(input_path)
+    else:
+        raise ValueError(f"Input must be a directory or a .jsonl file: {input_path}")
+
+    if not resume and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    # Failed items are terminal too, so a resumed run does not append a second record for them
+    finished = load_checkpoint(checkpoint_path)
+    if retry_errors:
+        finished = {item_id: status for item_id, status in finished.items() if status == "ok"}
+
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    stats = {"processed": 0, "ok": 0, "errors": 0, "skipped": 0, "input_words": 0}
+    start_time = time.time()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as output_file, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint_file, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(language, summary_length)) as executor:
+
+        def record(result: Dict[str, Any]):
+            output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output_file.flush()
+            stats["processed"] += 1
+            if result["status"] == "ok":
+                stats["ok"] += 1
+                stats["input_words"] += result.get("original_length", 0)
+            else:
+                stats["errors"] += 1
+                print(f"❌ {result['id']}: {result['error']}")
+            # Checkpoint only after the result is safely written
+            checkpoint_file.write(f"{result['id']}\t{result['status']}\n")
+            checkpoint_file.flush()
+
+        # Keep a bounded number of items in flight so huge corpora stream
+        in_flight = set()
+        max_in_flight = workers * 4
+        for item in items:
+            if item["id"] in finished:
+                stats["skipped"] += 1
+                continue
+            if "error" in item:
+                record({"id": item["id"], "status": "error", "title": item.get("title"), "error": item["error"]})
+                continue
+            in_flight.add(executor.submit(_process_item, item))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+
+        for future in wait(in_flight).done:
+            record(future.result())
+
+    elapsed = time.time() - start_time
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["items_per_second"] = round(stats["processed"] / elapsed, 2) if elapsed else 0.0
+    stats["words_per_second"] = round(stats["input_words"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Summarize a directory of PDFs/texts or a JSONL corpus without the web server"
+    )
+    parser.add_argument("input", help="Directory of .pdf/.txt/.md files or a .jsonl file")
+    parser.add_argument("-o", "--output", required=True, help="Output JSONL file")
+    parser.add_argument("--language", choices=["hindi", "english"], default="hindi")
+    parser.add_argument("--summary-length", choices=["short", "medium", "long", "auto"], default="auto")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPUs - 1)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore the checkpoint and start over")
+    parser.add_argument("--retry-errors", action="store_true",
+                        help="On resume, retry items that failed before (their new record is appended)")
+    args = parser.parse_args(argv)
+
+    output_path = Path(args.output)
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else output_path.with_name(output_path.name + ".checkpoint")
+
+    print(f"🚀 Batch summarizing {args.input} -> {output_path}")
+    try:
+        stats = run_batch(
+            input_path=Path(args.input),
+            output_path=output_path,
+            checkpoint_path=checkpoint_path,
+            language=args.language,
+            summary_length=args.summary_length,
+            workers=args.workers,
+            resume=not args.no_resume,
+            retry_errors=args.retry_errors
+        )
+    except KeyboardInterrupt:
+        print("\n👋 Interrupted; re-run the same command to resume from the checkpoint")
+        return 130
+    except Exception as e:
+        print(f"❌ Batch failed: {e}")
+        return 1
+
+    print("\n" + "=" * 50)
+    print(f"✅ Processed: {stats['processed']} (ok: {stats['ok']}, errors: {stats['errors']}, "
+          f"skipped from checkpoint: {stats['skipped']})")
+    print(f"⏱️  Elapsed: {stats['elapsed_seconds']}s")
+    print(f"📊 Throughput: {stats['items_per_second']} items/s, {stats['words_per_second']} input words/s")
+    return 0 if stats["errors"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
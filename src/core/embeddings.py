@@ -0,0 +1,124 @@
+"""
+Semantic Sentence Selection
+Batched multilingual sentence embeddings cached per sentence, with MMR redundancy removal
+"""
+
+import asyncio
+import importlib.util
+from typing import List, Optional
+
+import numpy as np
+
+from src.core.incremental import SentenceRecord
+
+# Only checked here; importing sentence-transformers pulls in torch, transformers and scipy,
+# so it is deferred until the opt-in semantic scorer is first used
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
+    print("sentence-transformers not installed. Semantic sentence selection will be unavailable.")
+
+# Small multilingual encoder (~120 MB) that covers Hindi and English
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+
+class SentenceEmbedder:
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 32):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = None
+        self.load_failed = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        return SENTENCE_TRANSFORMERS_AVAILABLE and not self.load_failed
+
+    async def load_model(self):
+        """Load the sentence encoder asynchronously"""
+        async with self._load_lock:
+            if self.model is not None or not self.available:
+                return
+            try:
+                print(f"Loading sentence encoder {self.model_name}...")
+                loop = asyncio.get_event_loop()
+                self.model = await loop.run_in_executor(None, self._load_sync)
+                print("Sentence encoder loaded successfully!")
+            except Exception as e:
+                print(f"Error loading sentence encoder: {e}")
+                self.load_failed = True
+
+    def _load_sync(self):
+        """Import sentence-transformers and load the encoder (blocking)"""
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.model_name, device="cpu")
+
+    async def embed(self, records: List[SentenceRecord]) -> Optional[np.ndarray]:
+        """Unit-normalized embeddings for the records, encoding only uncached sentences"""
+        await self.load_model()
+        if self.model is None:
+            return None
+
+        missing = [record for record in records if record.embedding is None]
+        if missing:
+            loop = asyncio.get_event_loop()
+            vectors = await loop.run_in_executor(None, lambda: self.model.encode(
+                [record.text for record in missing],
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ))
+            for record, vector in zip(missing, vectors):
+                record.embedding = vector.astype(np.float32)
+
+        return np.vstack([record.embedding for record in records])
+
+
+def mmr_select(
+    embeddings: np.ndarray,
+    relevance: np.ndarray,
+    word_counts: np.ndarray,
+    target_words: int,
+    diversity: float = 0.3,
+    redundancy_cutoff: float = 0.95
+) -> List[int]:
+    """Maximal Marginal Relevance selection of sentence indices within a word budget"""
+    count = len(relevance)
+    if count == 0:
+        return []
+
+    # Cosine similarity, since embeddings are unit-normalized
+    similarity = embeddings @ embeddings.T
+    max_similarity = np.zeros(count, dtype=np.float32)
+    available = np.ones(count, dtype=bool)
+    selected: List[int] = []
+    remaining_words = target_words
+
+    while True:
+        # Near-identical restatements are never worth their words
+        candidates = available & (word_counts <= remaining_words) & (max_similarity < redundancy_cutoff)
+        if not candidates.any():
+            break
+
+        scores = (1 - diversity) * relevance - diversity * max_similarity
+        scores[~candidates] = -np.inf
+        best = int(np.argmax(scores))
+
+        selected.append(best)
+        available[best] = False
+        remaining_words -= int(word_counts[best])
+        # Track each sentence's closest already-selected sentence incrementally
+        max_similarity = np.maximum(max_similarity, similarity[:, best])
+
+    return selected
+
+
+def semantic_relevance(embeddings: np.ndarray, intrinsic_scores: np.ndarray) -> np.ndarray:
+    """Blend centrality (similarity to the document centroid) with intrinsic sentence scores"""
+    centroid = embeddings.mean(axis=0)
+    norm = np.linalg.norm(centroid)
+    centrality = embeddings @ (centroid / norm) if norm > 0 else np.zeros(len(embeddings), dtype=np.float32)
+
+    peak = intrinsic_scores.max() if len(intrinsic_scores) else 0.0
+    intrinsic = intrinsic_scores / peak if peak > 0 else intrinsic_scores
+    return 0.7 * centrality + 0.3 * intrinsic
@@ -0,0 +1,197 @@
+"""
+Summary Exporters
+Render summaries to PDF, Word and Markdown bytes (PDF and Word in a worker pool), and stream many of them as one ZIP
+"""
+
+import asyncio
+import io
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from fpdf import FPDF
+from docx import Document
+
+from src.core.profiling import in_profiled_request
+
+FOOTER = "Generated by MultiLanguage AI Text Summarizer"
+
+
+def render_pdf(summary: str, title: str = "Summary", language: str = "hindi") -> bytes:
+    """Render a summary as PDF bytes"""
+    pdf = FPDF()
+    pdf.add_page()
+
+    # Use default fonts to avoid font issues
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, title.encode("latin-1", "replace").decode("latin-1"), 0, 1, "C")
+    pdf.ln(10)
+
+    # Core fonts are Latin-1 only
+    pdf.set_font("Helvetica", "", 12)
+    pdf.multi_cell(0, 8, str(summary).encode("latin-1", "replace").decode("latin-1"))
+
+    # Add footer
+    pdf.ln(20)
+    pdf.set_font("Helvetica", "I", 8)
+    pdf.cell(0, 10, f"{FOOTER} - {time.strftime('%Y-%m-%d %H:%M')}", 0, 1, "C")
+
+    return bytes(pdf.output())
+
+
+def render_word(summary: str, title: str = "Summary", language: str = "hindi") -> bytes:
+    """Render a summary as a Word document"""
+    doc = Document()
+    doc.add_heading(title, 0)
+    doc.add_paragraph(summary)
+
+    # Add metadata
+    doc.add_paragraph(f"\n\n{FOOTER}")
+    doc.add_paragraph(f"Date: {time.strftime('%Y-%m-%d %H:%M')}")
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def render_markdown(summary: str, title: str = "Summary", language: str = "hindi") -> bytes:
+    """Render a summary as Markdown"""
+    content = f"""# {title}
+
+{summary}
+
+---
+
+*{FOOTER}*  
+*Date: {time.strftime('%Y-%m-%d %H:%M')}*
+"""
+    return content.encode("utf-8")
+
+
+class ExportFormat(NamedTuple):
+    renderer: Callable[[str, str, str], bytes]
+    extension: str
+    media_type: str
+    # PDF and DOCX are already compressed containers; deflating them again only costs CPU
+    compress_type: int
+    # Only layout-heavy formats are worth pickling to a worker process
+    use_worker: bool = True
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "pdf": ExportFormat(render_pdf, "pdf", "application/pdf", zipfile.ZIP_STORED),
+    "word": ExportFormat(
+        render_word, "docx",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        zipfile.ZIP_STORED
+    ),
+    "markdown": ExportFormat(render_markdown, "md", "text/markdown", zipfile.ZIP_DEFLATED, use_worker=False),
+}
+
+
+def export_filename(title: str, export_format: str) -> str:
+    """Download filename for a title, safe inside headers and archives"""
+    stem = re.sub(r"[\\/:*?\"<>|\s]+", "_", title).strip("_.") or "Summary"
+    return f"{stem[:80]}.{EXPORT_FORMATS[export_format].extension}"
+
+
+def _render(export_format: str, summary: str, title: str, language: str) -> bytes:
+    """Render one export (runs in a worker process)"""
+    return EXPORT_FORMATS[export_format].renderer(summary, title, language)
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink that hands out whatever zipfile wrote since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportPool:
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(
+            os.environ.get("SUMMARIZER_EXPORT_WORKERS", max(1, min(4, (os.cpu_count() or 2) - 1)))
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self):
+        """Stop the export worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, export_format: str, summary: str, title: str, language: str) -> bytes:
+        """Render one summary in one format, on a worker process for PDF and DOCX"""
+        if not EXPORT_FORMATS[export_format].use_worker:
+            # Markdown is string formatting; a process round trip would cost far more than rendering
+            return _render(export_format, summary, title, language)
+        loop = asyncio.get_event_loop()
+        # A profiled request renders in-process so the sampler and tracemalloc can see it
+        executor = None if in_profiled_request() else self._get_executor()
+        return await loop.run_in_executor(executor, _render, export_format, summary, title, language)
+
+    async def stream_zip(self, jobs: Iterable[Tuple[str, str, str, str, str]]) -> AsyncIterator[bytes]:
+        """Render (name, format, summary, title, language) jobs concurrently and yield a ZIP as it is built
+
+        Only a bounded window of rendered files is held at a time; each is written to the
+        archive and sent as soon as it finishes, in completion order.
+        """
+        sink = _ZipStream()
+        archive = zipfile.ZipFile(sink, mode="w")
+        max_in_flight = self.max_workers * 2
+        in_flight: Dict[asyncio.Future, Tuple[str, str]] = {}
+        jobs = iter(jobs)
+
+        def submit_next() -> bool:
+            job = next(jobs, None)
+            if job is None:
+                return False
+            name, export_format, summary, title, language = job
+            future = asyncio.ensure_future(self.render(export_format, summary, title, language))
+            in_flight[future] = (name, export_format)
+            return True
+
+        try:
+            while len(in_flight) < max_in_flight and submit_next():
+                pass
+
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    name, export_format = in_flight.pop(future)
+                    try:
+                        compress_type = EXPORT_FORMATS[export_format].compress_type
+                        archive.writestr(name, future.result(), compress_type=compress_type)
+                    except Exception as e:
+                        # One failed render should not abort an archive that is already streaming
+                        print(f"Bulk export error for {name}: {e}")
+                        archive.writestr(f"{name}.error.txt", f"Failed to export: {e}\n")
+                    submit_next()
+                yield sink.drain()
+
+            archive.close()
+            yield sink.drain()
+        finally:
+            # Client went away mid-stream: drop renders nobody will read
+            for future in in_flight:
+                future.cancel()
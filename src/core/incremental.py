@@ -0,0 +1,139 @@
+"""
+Incremental Summarization State
+Per-sentence fingerprints and cached scores, plus per-document state for delta re-summarization
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Small stopword lists; sentences dense in these carry little information
+HINDI_STOPWORDS = frozenset("""
+और का की के को में से है हैं था थे थी पर भी यह वह ये वे एक इस उस इन उन
+तो ही कि जो कर किया किए गया गई गए हो होता होती होते रहा रही रहे लिए साथ
+नहीं ने अपने अपनी अपना कुछ कई सभी तक जब तब यदि या एवं तथा द्वारा बाद
+""".split())
+
+ENGLISH_STOPWORDS = frozenset("""
+a an the and or but if of to in on at by for with from as is are was were be been
+being it its this that these those he she they we you i his her their our your
+not no so than then there here which who whom what when where how all any some
+do does did has have had will would can could should may might must into about
+""".split())
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def sentence_fingerprint(sentence: str, language: str = "") -> str:
+    """Stable fingerprint of a sentence, insensitive to whitespace changes"""
+    normalized = WHITESPACE_PATTERN.sub(" ", sentence).strip()
+    return hashlib.blake2b(f"{language}:{normalized}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SentenceRecord:
+    """Cached per-sentence features, independent of the surrounding document"""
+
+    __slots__ = ("fingerprint", "text", "word_count", "score", "embedding")
+
+    def __init__(self, fingerprint: str, text: str, word_count: int, score: float):
+        self.fingerprint = fingerprint
+        self.text = text
+        self.word_count = word_count
+        self.score = score
+        self.embedding = None
+
+
+def score_sentence(sentence: str, language: str) -> Tuple[int, float]:
+    """Intrinsic informativeness score of a sentence and its word count"""
+    words = sentence.split()
+    tokens = TOKEN_PATTERN.findall(sentence.lower())
+    if not tokens:
+        return len(words), 0.0
+
+    stopwords = HINDI_STOPWORDS if language == "hindi" else ENGLISH_STOPWORDS
+    content_tokens = [t for t in tokens if t not in stopwords]
+    content_ratio = len(content_tokens) / len(tokens)
+    lexical_variety = len(set(content_tokens)) / max(len(content_tokens), 1)
+
+    # Numbers and proper nouns tend to carry the facts in news text
+    informative = sum(1 for t in tokens if any(c.isdigit() for c in t))
+    informative += sum(1 for w in words[1:] if w[:1].isupper())
+    informative_bonus = min(informative / len(tokens), 0.3)
+
+    # Prefer sentences of typical length over fragments and run-ons
+    length_factor = min(len(words), 12) / 12
+    if len(words) > 40:
+        length_factor *= 40 / len(words)
+
+    score = (0.6 * content_ratio + 0.4 * lexical_variety + informative_bonus) * length_factor
+    return len(words), round(score, 6)
+
+
+class SentenceCache:
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, SentenceRecord]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_score(self, sentence: str, language: str) -> Tuple[SentenceRecord, bool]:
+        """Return the cached record for a sentence, scoring it on a miss"""
+        fingerprint = sentence_fingerprint(sentence, language)
+        record = self._records.get(fingerprint)
+        if record is not None:
+            self._records.move_to_end(fingerprint)
+            self.hits += 1
+            return record, False
+
+        self.misses += 1
+        word_count, score = score_sentence(sentence, language)
+        record = SentenceRecord(fingerprint, sentence, word_count, score)
+        self._records[fingerprint] = record
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+        return record, True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._records), "hits": self.hits, "misses": self.misses}
+
+
+class DocumentState:
+    """Fingerprints and last result of a previously summarized document"""
+
+    __slots__ = ("fingerprints", "summary_length", "result", "digest")
+
+    def __init__(
+        self,
+        fingerprints: List[str],
+        summary_length: str,
+        result: Dict[str, Any],
+        digest: Optional[str] = None
+    ):
+        self.fingerprints = fingerprints
+        self.summary_length = summary_length
+        self.result = result
+        # Hash of the raw request (text and options), checked before any per-sentence work
+        self.digest = digest
+
+
+class DocumentIndex:
+    def __init__(self, max_documents: int = 2048):
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[str, DocumentState]" = OrderedDict()
+
+    def get(self, document_key: str) -> Optional[DocumentState]:
+        state = self._documents.get(document_key)
+        if state is not None:
+            self._documents.move_to_end(document_key)
+        return state
+
+    def put(self, document_key: str, state: DocumentState):
+        self._documents[document_key] = state
+        self._documents.move_to_end(document_key)
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._documents)
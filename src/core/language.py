@@ -0,0 +1,135 @@
+"""
+Language Detection and Text Normalization
+Dependency-free script/language detection and script-aware Unicode normalization, run once per input
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List
+
+from src.core.incremental import ENGLISH_STOPWORDS
+
+# Zero-width characters that only affect rendering or are copy-paste debris
+ZERO_WIDTH_PATTERN = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+# ASCII pipes used as danda between Devanagari words
+PIPE_DANDA_PATTERN = re.compile("(?<=[\u0900-\u097f])\\s*\\|\\|?(?=\\s|$)")
+DOUBLE_DANDA_PATTERN = re.compile("\u0964\\s*\u0964")
+HORIZONTAL_SPACE_PATTERN = re.compile("[ \\t\u00a0]+")
+
+# Sentence ends: dandas anywhere, Latin punctuation only before whitespace (keeps 2.5, U.S.A intact)
+SENTENCE_SPLIT_PATTERN = re.compile(r"[।॥]+|[.!?]+(?=\s|$)")
+
+# Frequent romanized Hindi function words, to tell Hinglish from English
+ROMAN_HINDI_WORDS = frozenset("""
+hai hain tha thi ka ki ke ko se mein par aur bhi yeh ye woh wo nahi nahin
+kya kyun kaise jo toh ek apne apni kar karna kiya gaya gayi raha rahi
+""".split())
+
+# Character trigrams most typical of English prose
+ENGLISH_TRIGRAMS = frozenset("""
+_th the he_ _an and nd_ ing ng_ _of of_ _to to_ ion tio _in ed_ er_ es_ _a_ _is
+is_ ent re_ _be hat tha _wa for _fo ati at_ on_ in_ ter
+""".split())
+
+MIN_LETTERS_FOR_DETECTION = 20
+
+
+class TextProfile:
+    """Normalized text plus the detected language and script"""
+
+    __slots__ = ("text", "language", "script", "confidence", "script_ratios")
+
+    def __init__(self, text: str, language: str, script: str, confidence: float, script_ratios: Dict[str, float]):
+        self.text = text
+        self.language = language
+        self.script = script
+        self.confidence = confidence
+        self.script_ratios = script_ratios
+
+
+def normalize_text(text: str) -> str:
+    """NFC, unified danda forms, no zero-width characters, single spaces"""
+    # NFC also decomposes the precomposed nukta letters (e.g. U+0958) into base + nukta,
+    # so both spellings of the same word compare equal
+    text = unicodedata.normalize("NFC", text)
+    text = ZERO_WIDTH_PATTERN.sub("", text)
+    text = PIPE_DANDA_PATTERN.sub(lambda m: "॥" if m.group().strip() == "||" else "।", text)
+    text = DOUBLE_DANDA_PATTERN.sub("॥", text)
+    return HORIZONTAL_SPACE_PATTERN.sub(" ", text).strip()
+
+
+def script_histogram(text: str) -> Dict[str, int]:
+    """Letter counts per Unicode block"""
+    counts = {"devanagari": 0, "latin": 0, "other": 0}
+    for char in text:
+        if "ऀ" <= char <= "ॿ" or "꣠" <= char <= "ꣿ":
+            counts["devanagari"] += 1
+        elif char.isalpha():
+            counts["latin" if char.isascii() or "À" <= char <= "ɏ" else "other"] += 1
+    return counts
+
+
+def _latin_language_scores(text: str) -> Dict[str, float]:
+    """Word and character n-gram evidence for English vs romanized Hindi"""
+    words = re.findall(r"[a-z]+", text.lower()[:20000])
+    if not words:
+        return {"english": 0.0, "hindi": 0.0}
+
+    english_words = sum(1 for w in words if w in ENGLISH_STOPWORDS)
+    hindi_words = sum(1 for w in words if w in ROMAN_HINDI_WORDS)
+
+    trigrams = Counter()
+    for word in words:
+        padded = f"_{word}_"
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    total_trigrams = sum(trigrams.values()) or 1
+    english_trigram_share = sum(count for gram, count in trigrams.items() if gram in ENGLISH_TRIGRAMS) / total_trigrams
+
+    return {
+        "english": english_words / len(words) + english_trigram_share,
+        "hindi": hindi_words / len(words)
+    }
+
+
+def analyze_text(text: str) -> TextProfile:
+    """Normalize text and detect its language and script in one pass"""
+    normalized = normalize_text(text)
+    counts = script_histogram(normalized)
+    letters = sum(counts.values())
+    ratios = {name: round(count / letters, 3) if letters else 0.0 for name, count in counts.items()}
+
+    # Script comes from the histogram even when there is too little text to guess the language
+    script = "devanagari" if letters and ratios["devanagari"] >= 0.5 else "latin"
+    if letters < MIN_LETTERS_FOR_DETECTION:
+        return TextProfile(normalized, "unknown", script, 0.0, ratios)
+
+    if script == "devanagari":
+        return TextProfile(normalized, "hindi", "devanagari", ratios["devanagari"], ratios)
+
+    scores = _latin_language_scores(normalized)
+    if scores["hindi"] > scores["english"]:
+        # Romanized Hindi (Hinglish)
+        confidence = scores["hindi"] / (scores["hindi"] + scores["english"])
+        return TextProfile(normalized, "hindi", "latin", round(confidence, 3), ratios)
+
+    total = scores["english"] + scores["hindi"]
+    confidence = scores["english"] / total if total else 0.0
+    return TextProfile(normalized, "english", "latin", round(confidence * ratios["latin"], 3), ratios)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split normalized text into sentences (Hindi dandas and Latin punctuation)"""
+    sentences = SENTENCE_SPLIT_PATTERN.split(text)
+    return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+
+
+# Detected language overrides the requested one only when the detector is this sure
+OVERRIDE_CONFIDENCE = 0.8
+
+
+def resolve_language(requested: str, profile: TextProfile) -> str:
+    """Language to process the text as: the detected one when confident, otherwise the requested one"""
+    if profile.language in ("hindi", "english") and profile.confidence >= OVERRIDE_CONFIDENCE:
+        return profile.language
+    return requested
@@ -0,0 +1,137 @@
+"""
+Summary Length Planning
+Computes the summary budget once, in words and model tokens, and picks whole sentences to fill it
+"""
+
+import math
+from typing import List, Literal, Optional, Sequence
+
+# Subword tokens per word for T5/mT5-style vocabularies; Devanagari splits into more pieces
+TOKENS_PER_WORD = {
+    "devanagari": 2.2,
+    "latin": 1.4,
+}
+
+# (divisor, minimum, maximum) of the target word count per summary length
+LENGTH_RULES = {
+    "short": (8, 20, 50),
+    "medium": (5, 40, 100),
+    "long": (3, 80, 200),
+}
+
+# Only the best-scored sentences enter the knapsack, which keeps it O(candidates x budget);
+# the pool holds a few times as many sentences as the budget can take, and never fewer than the minimum
+MIN_KNAPSACK_CANDIDATES = 60
+KNAPSACK_CANDIDATE_FACTOR = 2
+
+
+class SummaryBudget:
+    """Target summary size in words and model tokens"""
+
+    __slots__ = (
+        "summary_length", "target_words", "min_words", "target_tokens", "min_tokens", "max_words", "ratio"
+    )
+
+    def __init__(
+        self,
+        summary_length: str,
+        target_words: int,
+        min_words: int,
+        target_tokens: int,
+        min_tokens: int,
+        max_words: Optional[int] = None,
+        ratio: Optional[float] = None
+    ):
+        self.summary_length = summary_length
+        self.target_words = target_words
+        self.min_words = min_words
+        self.target_tokens = target_tokens
+        self.min_tokens = min_tokens
+        self.max_words = max_words
+        self.ratio = ratio
+
+    @property
+    def key(self) -> str:
+        """Cache key component; two requests with equal keys produce the same selection"""
+        return f"{self.summary_length}:{self.target_words}"
+
+    @property
+    def options_key(self) -> str:
+        """The size the caller asked for, independent of the word count it was derived from"""
+        return f"{self.summary_length}:{self.max_words}:{self.ratio}"
+
+
+def plan_budget(
+    word_count: int,
+    summary_length: Literal["short", "medium", "long", "auto"] = "auto",
+    script: str = "latin",
+    max_words: Optional[int] = None,
+    ratio: Optional[float] = None
+) -> SummaryBudget:
+    """Plan the summary size once for a document"""
+    # Handle auto summary length
+    if summary_length == "auto":
+        if word_count < 100:
+            summary_length = "short"
+        elif word_count < 500:
+            summary_length = "medium"
+        else:
+            summary_length = "long"
+
+    if ratio is not None:
+        target_words = round(word_count * ratio)
+    elif max_words is not None:
+        target_words = max_words
+    else:
+        divisor, minimum, maximum = LENGTH_RULES[summary_length]
+        target_words = min(maximum, max(minimum, word_count // divisor))
+
+    # An explicit max_words is a hard cap, also on ratio-based targets
+    if max_words is not None:
+        target_words = min(target_words, max_words)
+    target_words = max(1, min(target_words, word_count))
+    min_words = max(1, int(target_words * 0.6))
+
+    tokens_per_word = TOKENS_PER_WORD.get(script, TOKENS_PER_WORD["latin"])
+    return SummaryBudget(
+        summary_length=summary_length,
+        target_words=target_words,
+        min_words=min_words,
+        target_tokens=math.ceil(target_words * tokens_per_word),
+        min_tokens=math.ceil(min_words * tokens_per_word),
+        max_words=max_words,
+        ratio=ratio
+    )
+
+
+def select_sentences(word_counts: Sequence[int], values: Sequence[float], budget_words: int) -> List[int]:
+    """0/1 knapsack: whole sentences maximizing total value within the word budget"""
+    candidates = sorted(range(len(values)), key=lambda i: values[i], reverse=True)
+    candidates = [i for i in candidates if 0 < word_counts[i] <= budget_words]
+    if not candidates:
+        return []
+    typical_words = sorted(word_counts[i] for i in candidates)[len(candidates) // 2]
+    limit = max(MIN_KNAPSACK_CANDIDATES, KNAPSACK_CANDIDATE_FACTOR * math.ceil(budget_words / typical_words))
+    candidates = candidates[:limit]
+
+    best = [0.0] * (budget_words + 1)
+    keep = []
+    for i in candidates:
+        weight, value = word_counts[i], values[i]
+        taken = bytearray(budget_words + 1)
+        for capacity in range(budget_words, weight - 1, -1):
+            candidate_value = best[capacity - weight] + value
+            if candidate_value > best[capacity]:
+                best[capacity] = candidate_value
+                taken[capacity] = 1
+        keep.append(taken)
+
+    # Walk the decisions backwards to recover the chosen sentences
+    selected = []
+    capacity = budget_words
+    for position in range(len(candidates) - 1, -1, -1):
+        if keep[position][capacity]:
+            index = candidates[position]
+            selected.append(index)
+            capacity -= word_counts[index]
+    return sorted(selected)
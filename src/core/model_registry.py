@@ -0,0 +1,225 @@
+"""
+Model Registry
+Maps (language, quality tier) to seq2seq checkpoints, loaded on demand and kept in a memory-bounded LRU
+"""
+
+import asyncio
+import gc
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, Tuple
+
+
+class ModelSpec:
+    """A summarization checkpoint and how to prompt it"""
+
+    __slots__ = ("model_id", "prefix", "max_input_tokens", "estimated_mb")
+
+    def __init__(self, model_id: str, prefix: str = "", max_input_tokens: int = 512, estimated_mb: int = 1000):
+        self.model_id = model_id
+        self.prefix = prefix
+        self.max_input_tokens = max_input_tokens
+        self.estimated_mb = estimated_mb
+
+
+# mT5 fine-tuned on XL-Sum covers Hindi; t5-small is English-only
+DEFAULT_MODELS: Dict[Tuple[str, str], ModelSpec] = {
+    ("english", "fast"): ModelSpec("t5-small", prefix="summarize: ", max_input_tokens=512, estimated_mb=250),
+    ("english", "quality"): ModelSpec("facebook/bart-large-cnn", max_input_tokens=1024, estimated_mb=1700),
+    ("hindi", "fast"): ModelSpec("csebuetnlp/mT5_multilingual_XLSum", max_input_tokens=512, estimated_mb=2400),
+    ("hindi", "quality"): ModelSpec("csebuetnlp/mT5_multilingual_XLSum", max_input_tokens=512, estimated_mb=2400),
+}
+
+
+class ModelUnavailable(Exception):
+    """A checkpoint failed to load recently and is not retried until its cooldown ends"""
+
+
+class LoadedModel:
+    __slots__ = ("spec", "tokenizer", "model", "size_bytes", "loaded_at", "last_used")
+
+    def __init__(self, spec: ModelSpec, tokenizer, model, size_bytes: int):
+        self.spec = spec
+        self.tokenizer = tokenizer
+        self.model = model
+        self.size_bytes = size_bytes
+        self.loaded_at = time.time()
+        self.last_used = time.monotonic()
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        models: Optional[Dict[Tuple[str, str], ModelSpec]] = None,
+        max_memory_mb: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        retry_after_seconds: Optional[float] = None
+    ):
+        self.models = dict(models or DEFAULT_MODELS)
+        self.max_memory_bytes = int(max_memory_mb or os.environ.get("SUMMARIZER_MODEL_MEMORY_MB", "4096")) * 1024 * 1024
+        self.idle_ttl_seconds = float(idle_ttl_seconds or os.environ.get("SUMMARIZER_MODEL_IDLE_SECONDS", "1800"))
+        self._loaded: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        # Checkpoints that failed to load: model_id -> (monotonic time, error)
+        self.retry_after_seconds = float(
+            retry_after_seconds or os.environ.get("SUMMARIZER_MODEL_RETRY_SECONDS", "300")
+        )
+        self._failed: Dict[str, Tuple[float, str]] = {}
+        self.events = deque(maxlen=50)
+        self.loads = 0
+        self.evictions = 0
+        self.hits = 0
+        self.load_failures = 0
+
+    def resolve(self, language: str, tier: str = "fast") -> ModelSpec:
+        """Model for a language and tier, falling back to the language's fast tier, then English"""
+        return (
+            self.models.get((language, tier))
+            or self.models.get((language, "fast"))
+            or self.models[("english", "fast")]
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(loaded.size_bytes for loaded in self._loaded.values())
+
+    async def get(self, language: str, tier: str = "fast") -> LoadedModel:
+        """Return a loaded model for the request, loading and evicting as needed"""
+        spec = self.resolve(language, tier)
+        self.evict_idle()
+
+        loaded = self._loaded.get(spec.model_id)
+        if loaded is not None:
+            return self._touch(loaded)
+
+        self._raise_if_failed_recently(spec.model_id)
+        lock = self._load_locks.setdefault(spec.model_id, asyncio.Lock())
+        async with lock:
+            # Another request may have finished (or failed) loading while we waited
+            loaded = self._loaded.get(spec.model_id)
+            if loaded is not None:
+                return self._touch(loaded)
+            self._raise_if_failed_recently(spec.model_id)
+
+            print(f"Loading model {spec.model_id} for {language}/{tier}...")
+            start_time = time.time()
+            try:
+                loop = asyncio.get_event_loop()
+                tokenizer, model = await loop.run_in_executor(None, self._load_sync, spec.model_id)
+            except Exception as e:
+                self.load_failures += 1
+                self._failed[spec.model_id] = (time.monotonic(), str(e))
+                self._record("load_failed", spec.model_id, error=str(e))
+                raise
+
+            self._failed.pop(spec.model_id, None)
+            size_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+            loaded = LoadedModel(spec, tokenizer, model, size_bytes)
+            self._loaded[spec.model_id] = loaded
+            self.loads += 1
+            self._record("load", spec.model_id, size_mb=round(size_bytes / 1024 / 1024, 1),
+                         seconds=round(time.time() - start_time, 2))
+            print(f"Model {spec.model_id} loaded successfully!")
+
+            # Evict only once the load succeeded, so a broken checkpoint never costs the working ones
+            self._make_room(0, keep=spec.model_id)
+            return loaded
+
+    def _load_sync(self, model_id: str):
+        """Synchronous model loading"""
+        # Deferred, like torch in generate_summary, so the default extractive path
+        # never pays for importing torch or transformers
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
+        model.eval()
+        return tokenizer, model
+
+    def _raise_if_failed_recently(self, model_id: str):
+        failure = self._failed.get(model_id)
+        if failure is None:
+            return
+        failed_at, error = failure
+        remaining = self.retry_after_seconds - (time.monotonic() - failed_at)
+        if remaining > 0:
+            raise ModelUnavailable(f"Model {model_id} failed to load ({error}); retrying in {int(remaining)}s")
+        del self._failed[model_id]
+
+    def _touch(self, loaded: LoadedModel) -> LoadedModel:
+        loaded.last_used = time.monotonic()
+        self._loaded.move_to_end(loaded.spec.model_id)
+        self.hits += 1
+        return loaded
+
+    def _make_room(self, incoming_bytes: int, keep: Optional[str] = None):
+        """Evict least recently used models until the incoming model fits the budget"""
+        for model_id in list(self._loaded):
+            if self.memory_bytes + incoming_bytes <= self.max_memory_bytes:
+                break
+            if model_id != keep:
+                self._evict(model_id, reason="memory")
+
+    def evict_idle(self):
+        """Evict models that have not served a request within the idle TTL"""
+        now = time.monotonic()
+        for model_id, loaded in list(self._loaded.items()):
+            if now - loaded.last_used > self.idle_ttl_seconds:
+                self._evict(model_id, reason="idle")
+
+    def _evict(self, model_id: str, reason: str):
+        loaded = self._loaded.pop(model_id, None)
+        if loaded is None:
+            return
+        self.evictions += 1
+        self._record("evict", model_id, reason=reason, size_mb=round(loaded.size_bytes / 1024 / 1024, 1))
+        print(f"Evicted model {model_id} ({reason})")
+        del loaded
+        gc.collect()
+
+    def _record(self, event: str, model_id: str, **details):
+        self.events.append({"event": event, "model": model_id, "time": round(time.time(), 3), **details})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": [
+                {
+                    "model": model_id,
+                    "size_mb": round(loaded.size_bytes / 1024 / 1024, 1),
+                    "idle_seconds": round(time.monotonic() - loaded.last_used, 1)
+                }
+                for model_id, loaded in self._loaded.items()
+            ],
+            "memory_mb": round(self.memory_bytes / 1024 / 1024, 1),
+            "max_memory_mb": round(self.max_memory_bytes / 1024 / 1024, 1),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "hits": self.hits,
+            "load_failures": self.load_failures,
+            "failed": sorted(self._failed),
+            "events": list(self.events)
+        }
+
+
+def generate_summary(loaded: LoadedModel, text: str, max_tokens: int, min_tokens: int) -> str:
+    """Run seq2seq generation for one text (blocking; call from an executor)"""
+    import torch
+
+    spec = loaded.spec
+    inputs = loaded.tokenizer(
+        spec.prefix + text,
+        max_length=spec.max_input_tokens,
+        truncation=True,
+        return_tensors="pt"
+    )
+    with torch.no_grad():
+        output_ids = loaded.model.generate(
+            **inputs,
+            max_length=max_tokens,
+            min_length=min_tokens,
+            num_beams=4,
+            no_repeat_ngram_size=3,
+            early_stopping=True
+        )
+    return loaded.tokenizer.decode(output_ids[0], skip_special_tokens=True).strip()
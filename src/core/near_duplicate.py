@@ -0,0 +1,235 @@
+"""
+Near-Duplicate Detection
+MinHash signatures with LSH banding over normalized word shingles, persistable to disk
+"""
+
+import hashlib
+import json
+import random
+import re
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+# 2^31 - 1 keeps a * x + b below 2^63, so the permutations vectorize in uint64 without overflow
+MERSENNE_PRIME = (1 << 31) - 1
+MAX_HASH = (1 << 64) - 1
+FILE_MAGIC = b"MHLSH002"
+# Shingles hashed per broadcast, bounding the (shingles x permutations) temporary
+SIGNATURE_CHUNK = 4096
+
+NORMALIZE_PATTERN = re.compile(r"[^\w\s]+", re.UNICODE)
+
+
+def normalize_for_shingles(text: str) -> List[str]:
+    """Lowercase, drop punctuation and split into tokens"""
+    return NORMALIZE_PATTERN.sub(" ", text.lower()).split()
+
+
+class MinHashLSHIndex:
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.85,
+        shingle_size: int = 3,
+        capacity: int = 10000,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.capacity = capacity
+        self.seed = seed
+
+        rng = random.Random(seed)
+        self._perm_a = np.array([rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.uint64)
+        self._perm_b = np.array([rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.uint64)
+
+        # Slot-indexed storage; slots are reused round-robin once capacity is reached
+        self._signatures = array("Q")
+        self._keys: List[Optional[str]] = []
+        self._slot_of: Dict[str, int] = {}
+        self._payloads: List[Optional[Dict[str, Any]]] = []
+        self._next_slot = 0
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+
+        self.queries = 0
+        self.hits = 0
+        self.inserts = 0
+        self.evictions = 0
+
+    # Signatures
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        tokens = normalize_for_shingles(text)
+        if len(tokens) >= self.shingle_size:
+            shingles = {" ".join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+        else:
+            shingles = {" ".join(tokens)}
+        digests = b"".join(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest() for s in shingles)
+        return np.frombuffer(digests, dtype="<u8") % np.uint64(MERSENNE_PRIME)
+
+    def signature(self, text: str) -> array:
+        """MinHash signature of a text (CPU-bound; call from an executor)"""
+        hashes = self._shingle_hashes(text)
+        minimums = np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        prime = np.uint64(MERSENNE_PRIME)
+        for start in range(0, len(hashes), SIGNATURE_CHUNK):
+            chunk = hashes[start:start + SIGNATURE_CHUNK, None]
+            permuted = (self._perm_a * chunk + self._perm_b) % prime
+            np.minimum(minimums, permuted.min(axis=0), out=minimums)
+        return array("Q", minimums.tolist())
+
+    def _band_keys(self, signature) -> List[int]:
+        return [
+            hash(tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def _slot_signature(self, slot: int) -> array:
+        return self._signatures[slot * self.num_perm:(slot + 1) * self.num_perm]
+
+    # Index operations
+
+    def query(
+        self,
+        signature,
+        exclude_key: Optional[str] = None,
+        accept: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Optional[Tuple[str, float, Dict[str, Any]]]:
+        """Best stored match at or above the threshold as (key, similarity, payload)"""
+        self.queries += 1
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        best = None
+        for slot in candidates:
+            key = self._keys[slot]
+            if key is None or key == exclude_key:
+                continue
+            if accept is not None and not accept(self._payloads[slot]):
+                continue
+            stored = self._slot_signature(slot)
+            similarity = sum(1 for x, y in zip(signature, stored) if x == y) / self.num_perm
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity, self._payloads[slot])
+
+        if best is not None:
+            self.hits += 1
+        return best
+
+    def insert(self, key: str, signature, payload: Dict[str, Any]):
+        """Add a document, updating it in place if the key is already indexed,
+        otherwise replacing the oldest one when the index is full"""
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            self._remove_from_buckets(slot)
+        else:
+            slot = self._next_slot
+            self._next_slot = (self._next_slot + 1) % self.capacity
+            if slot < len(self._keys) and self._keys[slot] is not None:
+                self._remove_from_buckets(slot)
+                del self._slot_of[self._keys[slot]]
+                self.evictions += 1
+        self._slot_of[key] = slot
+
+        if slot < len(self._keys):
+            self._signatures[slot * self.num_perm:(slot + 1) * self.num_perm] = array("Q", signature)
+            self._keys[slot] = key
+            self._payloads[slot] = payload
+        else:
+            self._signatures.extend(signature)
+            self._keys.append(key)
+            self._payloads.append(payload)
+
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(slot)
+        self.inserts += 1
+
+    def _remove_from_buckets(self, slot: int):
+        for band, band_key in enumerate(self._band_keys(self._slot_signature(slot))):
+            bucket = self._buckets[band].get(band_key)
+            if bucket and slot in bucket:
+                bucket.remove(slot)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def __len__(self) -> int:
+        return sum(1 for key in self._keys if key is not None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self),
+            "capacity": self.capacity,
+            "threshold": self.threshold,
+            "queries": self.queries,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.queries, 4) if self.queries else 0.0,
+            "inserts": self.inserts,
+            "evictions": self.evictions,
+            "signature_bytes": self._signatures.itemsize * len(self._signatures)
+        }
+
+    # Persistence
+
+    def save(self, path: str):
+        """Write the index to disk as a JSON header followed by the raw signature array"""
+        header = json.dumps({
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "capacity": self.capacity,
+            "seed": self.seed,
+            "next_slot": self._next_slot,
+            "keys": self._keys,
+            "payloads": self._payloads
+        }, ensure_ascii=False).encode("utf-8")
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_suffix(target.suffix + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(FILE_MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            self._signatures.tofile(f)
+        temp_path.replace(target)
+
+    @classmethod
+    def load(cls, path: str, threshold: float = 0.85) -> "MinHashLSHIndex":
+        """Read an index written by save()"""
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{path} is not a near-duplicate index file")
+            (header_length,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_length).decode("utf-8"))
+
+            index = cls(
+                num_perm=header["num_perm"],
+                bands=header["bands"],
+                threshold=threshold,
+                shingle_size=header["shingle_size"],
+                capacity=header["capacity"],
+                seed=header["seed"]
+            )
+            index._keys = header["keys"]
+            index._slot_of = {key: slot for slot, key in enumerate(index._keys) if key is not None}
+            index._payloads = header["payloads"]
+            index._next_slot = header["next_slot"]
+            index._signatures.fromfile(f, len(index._keys) * index.num_perm)
+
+        for slot, key in enumerate(index._keys):
+            if key is not None:
+                for band, band_key in enumerate(index._band_keys(index._slot_signature(slot))):
+                    index._buckets[band].setdefault(band_key, []).append(slot)
+        return index
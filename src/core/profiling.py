@@ -0,0 +1,273 @@
+"""
+Request Profiling
+Admin-only sampling profiler (folded stacks for flame graphs) and tracemalloc reports, per request or continuous
+"""
+
+import hmac
+import os
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Leaf frames of threads that are parked, not working; they would otherwise dominate every profile
+IDLE_FRAMES = frozenset({
+    "select", "poll", "wait", "_worker", "accept", "_wait_for_tstate_lock",
+    "_recv_bytes", "_poll", "readinto"
+})
+
+# A profile whose response body was never consumed stops blocking new ones after this long
+STALE_PROFILE_SECONDS = 300
+
+# Set inside a profiled request so work that normally leaves the process stays visible
+_profiling_request: ContextVar[bool] = ContextVar("profiling_request", default=False)
+
+
+def in_profiled_request() -> bool:
+    """Whether the current task is serving a profiled request"""
+    return _profiling_request.get()
+
+
+@contextmanager
+def profiled_request_scope() -> Iterator[None]:
+    """Mark the code inside, and tasks it spawns, as serving a profiled request"""
+    token = _profiling_request.set(True)
+    try:
+        yield
+    finally:
+        _profiling_request.reset(token)
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename.replace("\\", "/").split("/")
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+def fold_stack(frame, thread_name: str) -> Optional[str]:
+    """Root-first, semicolon-joined stack of a frame, or None for an idle thread"""
+    if frame is None or frame.f_code.co_name in IDLE_FRAMES:
+        return None
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Background thread that samples every other thread's stack at a fixed interval"""
+
+    # Samplers never sample each other
+    _sampler_idents = set()
+
+    def __init__(self, interval: float, max_stacks: int = 5000):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        StackSampler._sampler_idents.add(own_ident)
+        try:
+            while not self._stop.wait(self.interval):
+                self.sample()
+        finally:
+            StackSampler._sampler_idents.discard(own_ident)
+
+    def sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        folded = [
+            fold_stack(frame, names.get(ident, f"thread-{ident}"))
+            for ident, frame in sys._current_frames().items()
+            if ident not in StackSampler._sampler_idents
+        ]
+        with self._lock:
+            self.samples += 1
+            self.stacks.update(stack for stack in folded if stack)
+            if len(self.stacks) > self.max_stacks:
+                # Keep the hot half; rare stacks are noise at this volume
+                self.stacks = Counter(dict(self.stacks.most_common(self.max_stacks // 2)))
+
+    def folded(self) -> str:
+        """Profile in the folded format read by flamegraph.pl and speedscope"""
+        with self._lock:
+            return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def hot_stacks(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            total = sum(self.stacks.values()) or 1
+            return [
+                {"stack": stack, "samples": count, "share": round(count / total, 4)}
+                for stack, count in self.stacks.most_common(limit)
+            ]
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+
+
+class RequestProfile:
+    """CPU samples and allocations of one request"""
+
+    def __init__(self, profile_id: str, label: str, interval: float, top_allocations: int = 15):
+        self.profile_id = profile_id
+        self.label = label
+        self.top_allocations = top_allocations
+        self.sampler = StackSampler(interval)
+        self.report: Optional[Dict[str, Any]] = None
+        self._started_tracemalloc = False
+        self.started_at = 0.0
+
+    def start(self):
+        if tracemalloc.is_tracing():
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        else:
+            tracemalloc.start(10)
+            self._started_tracemalloc = True
+        self.started_at = time.perf_counter()
+        self.sampler.start()
+
+    def finish(self) -> Dict[str, Any]:
+        if self.report is not None:
+            return self.report
+        self.sampler.stop()
+        wall_seconds = time.perf_counter() - self.started_at
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        self.report = {
+            "profile_id": self.profile_id,
+            "label": self.label,
+            "wall_seconds": round(wall_seconds, 3),
+            "cpu": {
+                "interval_ms": round(self.sampler.interval * 1000, 2),
+                "samples": self.sampler.samples,
+                "hot_stacks": self.sampler.hot_stacks(),
+                "folded": self.sampler.folded()
+            },
+            "memory": {
+                "peak_mb": round(peak / 1024 / 1024, 2),
+                "current_mb": round(current / 1024 / 1024, 2),
+                "top_allocations": [
+                    {
+                        "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        "size_kb": round(stat.size / 1024, 1),
+                        "count": stat.count
+                    }
+                    for stat in snapshot.statistics("lineno")[:self.top_allocations]
+                ]
+            }
+        }
+        return self.report
+
+
+class ProfilerBusy(Exception):
+    """Another request is already being profiled"""
+
+
+class Profiler:
+    def __init__(
+        self,
+        admin_token: Optional[str] = None,
+        request_interval: float = 0.005,
+        continuous_hz: Optional[float] = None,
+        max_reports: int = 32
+    ):
+        self.admin_token = admin_token if admin_token is not None else os.environ.get("SUMMARIZER_ADMIN_TOKEN", "")
+        self.request_interval = request_interval
+        self.continuous_interval = 1 / float(continuous_hz or os.environ.get("SUMMARIZER_PROFILE_SAMPLE_HZ", "10"))
+        self.max_reports = max_reports
+        self.reports: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self.continuous = StackSampler(self.continuous_interval)
+        self.continuous_started_at: Optional[float] = None
+        # tracemalloc is process-wide, so one request profile at a time
+        self._active: Optional[RequestProfile] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Profiling exists only when an admin token is configured"""
+        return bool(self.admin_token)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        # compare_digest only accepts ASCII str, and headers arrive latin-1 decoded; compare bytes
+        return (
+            self.enabled
+            and token is not None
+            and hmac.compare_digest(token.encode("utf-8"), self.admin_token.encode("utf-8"))
+        )
+
+    def start_request(self, label: str) -> RequestProfile:
+        if self._active is not None:
+            if time.perf_counter() - self._active.started_at < STALE_PROFILE_SECONDS:
+                raise ProfilerBusy("Another request is being profiled")
+            self.finish_request(self._active)
+        profile = RequestProfile(secrets.token_urlsafe(8), label, self.request_interval)
+        self._active = profile
+        profile.start()
+        return profile
+
+    def finish_request(self, profile: RequestProfile) -> Dict[str, Any]:
+        try:
+            report = profile.finish()
+        finally:
+            if self._active is profile:
+                self._active = None
+        self.reports[profile.profile_id] = profile
+        while len(self.reports) > self.max_reports:
+            self.reports.popitem(last=False)
+        return report
+
+    def get_report(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        profile = self.reports.get(profile_id)
+        return profile.report if profile is not None else None
+
+    # Continuous sampling
+
+    def start_continuous(self):
+        if not self.continuous.running:
+            self.continuous.start()
+            self.continuous_started_at = time.time()
+
+    def stop_continuous(self):
+        self.continuous.stop()
+
+    def continuous_stats(self, limit: int = 20) -> Dict[str, Any]:
+        return {
+            "running": self.continuous.running,
+            "started_at": self.continuous_started_at,
+            "interval_ms": round(self.continuous.interval * 1000, 2),
+            "samples": self.continuous.samples,
+            "hot_stacks": self.continuous.hot_stacks(limit)
+        }
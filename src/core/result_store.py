@@ -0,0 +1,73 @@
+"""
+Result Storage
+Server-side LRU/TTL store for summarization results, addressed by short IDs
+"""
+
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class StoredResult:
+    """A stored summarization result plus its cached rendering"""
+
+    __slots__ = ("result_id", "data", "created_at", "etag", "html")
+
+    def __init__(self, result_id: str, data: Dict[str, Any]):
+        self.result_id = result_id
+        self.data = data
+        self.created_at = time.monotonic()
+        # Results are immutable once stored, so the ETag never changes
+        digest = hashlib.blake2b(
+            f"{result_id}:{data.get('summary', '')}:{data.get('title', '')}".encode("utf-8"),
+            digest_size=12
+        ).hexdigest()
+        self.etag = f'"{digest}"'
+        self.html: Optional[str] = None
+
+
+class ResultStore:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 6 * 60 * 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, data: Dict[str, Any]) -> str:
+        """Store a result and return its short ID"""
+        with self._lock:
+            self._evict_expired()
+            result_id = secrets.token_urlsafe(8)
+            while result_id in self._entries:
+                result_id = secrets.token_urlsafe(8)
+            self._entries[result_id] = StoredResult(result_id, data)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return result_id
+
+    def get(self, result_id: str) -> Optional[StoredResult]:
+        """Look up a result by ID, refreshing its LRU position"""
+        with self._lock:
+            entry = self._entries.get(result_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.created_at > self.ttl_seconds:
+                del self._entries[result_id]
+                return None
+            self._entries.move_to_end(result_id)
+            return entry
+
+    def _evict_expired(self):
+        """Drop expired entries from the cold end of the LRU"""
+        now = time.monotonic()
+        while self._entries:
+            oldest_id, oldest = next(iter(self._entries.items()))
+            if now - oldest.created_at <= self.ttl_seconds:
+                break
+            del self._entries[oldest_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,86 @@
+"""
+Request Coalescing
+Single-flight execution: concurrent calls with the same key share one in-progress task
+"""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory() once per key at a time; every concurrent caller gets a copy of its result"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # A disconnecting caller must not cancel the work other callers are waiting on
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # Nobody is left to receive the result; forget the flight before its
+                # done-callback runs so a request arriving meanwhile starts fresh work
+                self.abandoned += 1
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+        # Callers annotate their result (title, result_id), so each gets its own copy
+        return copy.copy(result)
+
+    def _finish(self, key: str, flight: _Flight):
+        """Forget the flight once it settles, so failures and cancellations are never reused"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled() and flight.task.exception() is not None:
+            self.failed += 1
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "abandoned": self.abandoned
+        }
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for coalescing: lowercase scheme and host, no fragment"""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def flight_key(*parts: Optional[Any]) -> str:
+    """Join request identity and options into one coalescing key"""
+    return "|".join("" if part is None else str(part) for part in parts)
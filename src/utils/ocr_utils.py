@@ -0,0 +1,181 @@
+"""
+OCR Utilities
+Per-page Tesseract OCR for scanned PDFs, run in a process pool and cached by page content hash
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from src.core.profiling import in_profiled_request
+
+try:
+    import pytesseract
+    from PIL import Image
+    OCR_AVAILABLE = True
+except ImportError:
+    print("pytesseract/Pillow not installed. OCR for scanned PDFs will be unavailable.")
+    pytesseract = None
+    Image = None
+    OCR_AVAILABLE = False
+
+# 300 DPI keeps Devanagari matras and nuktas legible without oversized bitmaps
+DEFAULT_OCR_DPI = 300
+DEFAULT_OCR_LANGUAGES = "hin+eng"
+
+
+def _ocr_page(pdf_path: str, page_number: int, dpi: int, languages: str) -> str:
+    """Rasterize one page and OCR it (runs in a worker process)"""
+    doc = fitz.open(pdf_path)
+    try:
+        pixmap = doc.load_page(page_number).get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        image = Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+    finally:
+        doc.close()
+    return pytesseract.image_to_string(image, lang=languages)
+
+
+class OCRProcessor:
+    def __init__(
+        self,
+        languages: str = DEFAULT_OCR_LANGUAGES,
+        dpi: int = DEFAULT_OCR_DPI,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        memory_cache_size: int = 512
+    ):
+        self.languages = languages
+        self.dpi = dpi
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.cache_dir = Path(
+            cache_dir
+            or os.environ.get("SUMMARIZER_OCR_CACHE_DIR")
+            or Path(tempfile.gettempdir()) / "summarizer_ocr_cache"
+        )
+        self.memory_cache_size = memory_cache_size
+        self._memory_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tesseract_checked = False
+        self._tesseract_available = False
+
+    @property
+    def available(self) -> bool:
+        """Whether pytesseract and the tesseract binary are both usable"""
+        if not OCR_AVAILABLE:
+            return False
+        if not self._tesseract_checked:
+            self._tesseract_checked = True
+            try:
+                pytesseract.get_tesseract_version()
+                self._tesseract_available = True
+            except Exception as e:
+                print(f"Tesseract not available, OCR disabled: {e}")
+        return self._tesseract_available
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self):
+        """Stop the OCR worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def page_content_hash(self, doc, page_number: int) -> str:
+        """Hash of a page's content stream and embedded images, independent of the file around it"""
+        page = doc.load_page(page_number)
+        digest = hashlib.sha256()
+        digest.update(f"{self.languages}:{self.dpi}:".encode("utf-8"))
+        digest.update(page.read_contents() or b"")
+        for image in page.get_images(full=True):
+            digest.update(doc.xref_stream_raw(image[0]) or b"")
+        return digest.hexdigest()
+
+    # Cache
+
+    def _cache_get(self, content_hash: str) -> Optional[str]:
+        text = self._memory_cache.get(content_hash)
+        if text is not None:
+            self._memory_cache.move_to_end(content_hash)
+            return text
+
+        cache_file = self.cache_dir / f"{content_hash}.txt"
+        if cache_file.exists():
+            text = cache_file.read_text(encoding="utf-8")
+            self._memory_put(content_hash, text)
+            return text
+        return None
+
+    def _memory_put(self, content_hash: str, text: str):
+        self._memory_cache[content_hash] = text
+        self._memory_cache.move_to_end(content_hash)
+        while len(self._memory_cache) > self.memory_cache_size:
+            self._memory_cache.popitem(last=False)
+
+    def _cache_put(self, content_hash: str, text: str):
+        self._memory_put(content_hash, text)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{content_hash}.txt").write_text(text, encoding="utf-8")
+        except OSError as e:
+            print(f"Failed to write OCR cache: {e}")
+
+    # OCR
+
+    async def ocr_pages(self, pdf_path: str, page_numbers: List[int]) -> Dict[int, str]:
+        """OCR the given pages in parallel, skipping pages already in the cache"""
+        if not page_numbers or not self.available:
+            return {}
+
+        doc = fitz.open(pdf_path)
+        try:
+            hashes = {page_number: self.page_content_hash(doc, page_number) for page_number in page_numbers}
+        finally:
+            doc.close()
+
+        results: Dict[int, str] = {}
+        pending: Dict[int, str] = {}
+        for page_number, content_hash in hashes.items():
+            cached = self._cache_get(content_hash)
+            if cached is not None:
+                results[page_number] = cached
+            else:
+                pending[page_number] = content_hash
+
+        if pending:
+            print(f"Running OCR on {len(pending)} page(s) ({len(results)} cached)")
+            if in_profiled_request():
+                # A profiled request OCRs in-process so the sampler and tracemalloc can see it. PyMuPDF is
+                # not thread-safe and the rest of the app uses it on the event loop thread, so pages run
+                # one after another right here instead of on executor threads
+                ocr_results = []
+                for page_number in pending:
+                    try:
+                        ocr_results.append(_ocr_page(pdf_path, page_number, self.dpi, self.languages))
+                    except Exception as e:
+                        ocr_results.append(e)
+            else:
+                loop = asyncio.get_event_loop()
+                executor = self._get_executor()
+                ocr_results = await asyncio.gather(*[
+                    loop.run_in_executor(executor, _ocr_page, pdf_path, page_number, self.dpi, self.languages)
+                    for page_number in pending
+                ], return_exceptions=True)
+
+            for (page_number, content_hash), text in zip(pending.items(), ocr_results):
+                if isinstance(text, Exception):
+                    print(f"OCR failed for page {page_number + 1}: {text}")
+                    continue
+                self._cache_put(content_hash, text)
+                results[page_number] = text
+
+        return results
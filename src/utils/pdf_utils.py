@@ -6,56 +6,64 @@ Handles PDF text extraction with OCR fallback
 import asyncio
 import os
 import tempfile
-from typing import Optional
+from typing import Optional, List
 import fitz  # PyMuPDF
 import PyPDF2
 from io import BytesIO
 
+from src.utils.ocr_utils import OCRProcessor
+
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, ocr_processor: Optional[OCRProcessor] = None):
         self.max_pages = 15  # Limit to 15 pages as per requirements
+        self.ocr_processor = ocr_processor or OCRProcessor()
     
     async def extract_text(self, pdf_path: str) -> str:
         """Extract text from PDF with multiple fallback methods"""
         try:
-            # Method 1: Try PyMuPDF (fitz) first
-            text = await self._extract_with_pymupdf(pdf_path)
+            # Method 1: Try PyMuPDF (fitz) first, page by page
+            page_texts = await self._extract_pages_with_pymupdf(pdf_path)
+            
+            # Method 2: OCR only the pages without a text layer (scanned pages)
+            empty_pages = [page_num for page_num, page_text in enumerate(page_texts) if not page_text.strip()]
+            if empty_pages:
+                ocr_texts = await self.ocr_processor.ocr_pages(pdf_path, empty_pages)
+                for page_num, page_text in ocr_texts.items():
+                    page_texts[page_num] = page_text
+            
+            text = "\n".join(page_text for page_text in page_texts if page_text.strip())
             if text and len(text.strip()) > 50:
                 return text
             
-            # Method 2: Fallback to PyPDF2
+            # Method 3: Fallback to PyPDF2
             text = await self._extract_with_pypdf2(pdf_path)
             if text and len(text.strip()) > 50:
                 return text
             
-            # Method 3: OCR fallback (if needed)
-            # For now, return what we have
             return text or "No readable text found in PDF"
             
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
     
-    async def _extract_with_pymupdf(self, pdf_path: str) -> str:
-        """Extract text using PyMuPDF"""
+    async def _extract_pages_with_pymupdf(self, pdf_path: str) -> List[str]:
+        """Extract per-page text using PyMuPDF"""
         try:
             doc = fitz.open(pdf_path)
-            text_parts = []
+            page_texts = []
             
             # Limit to max_pages
             page_count = min(len(doc), self.max_pages)
             
             for page_num in range(page_count):
                 page = doc.load_page(page_num)
-                text = page.get_text()
-                if text.strip():
-                    text_parts.append(text)
+                page_texts.append(page.get_text())
             
             doc.close()
-            return "\n".join(text_parts)
+            return page_texts
             
         except Exception as e:
             print(f"PyMuPDF extraction failed: {e}")
-            return ""
+            return []
     
     async def _extract_with_pypdf2(self, pdf_path: str) -> str:
         """Extract text using PyPDF2 as fallback"""
@@ -8,6 +8,8 @@ import re
 from typing import Dict, Any, Literal, Optional
 from urllib.parse import urlparse, parse_qs
 
+from src.core.single_flight import SingleFlight, flight_key
+
 try:
     from youtube_transcript_api import YouTubeTranscriptApi
     from youtube_transcript_api.formatters import TextFormatter
@@ -19,8 +21,12 @@ except ImportError:
     YOUTUBE_API_AVAILABLE = False
 
 class YouTubeProcessor:
-    def __init__(self):
+    def __init__(self, summarizer=None):
         self.formatter = TextFormatter() if TextFormatter else None
+        # Shared summarizer so transcripts benefit from its sentence and document caches
+        self.summarizer = summarizer
+        # Identical video requests in flight at the same time share one fetch and summary
+        self.flights = SingleFlight()
     
     def extract_video_id(self, url: str) -> Optional[str]:
         """Extract YouTube video ID from URL"""
@@ -43,7 +49,12 @@ class YouTubeProcessor:
             return None
     
     async def get_transcript(self, video_id: str, language: str = "en") -> str:
-        """Get transcript for YouTube video using the new API"""
+        """Get transcript for YouTube video without blocking the event loop"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._fetch_transcript, video_id, language)
+    
+    def _fetch_transcript(self, video_id: str, language: str) -> str:
+        """Get transcript for YouTube video using the new API (blocking)"""
         if not YOUTUBE_API_AVAILABLE or not YouTubeTranscriptApi:
             raise Exception("YouTube transcript API not available. Please install youtube-transcript-api: pip install youtube-transcript-api")
         
@@ -158,7 +169,12 @@ class YouTubeProcessor:
         self, 
         url: str, 
         language: Literal["hindi", "english"] = "hindi",
-        summary_length: Literal["short", "medium", "long", "auto"] = "auto"
+        summary_length: Literal["short", "medium", "long", "auto"] = "auto",
+        scorer: Literal["heuristic", "semantic"] = "heuristic",
+        method: Literal["extractive", "abstractive"] = "extractive",
+        quality: Literal["fast", "quality"] = "fast",
+        max_words: Optional[int] = None,
+        ratio: Optional[float] = None
     ) -> Dict[str, Any]:
         """Extract transcript and summarize YouTube video"""
         try:
@@ -171,52 +187,11 @@ class YouTubeProcessor:
             if not self.is_valid_youtube_url(url):
                 raise Exception("Invalid YouTube URL format. Please provide a valid YouTube video URL.")
             
-            # Get video info
-            video_info = await self.get_video_info(video_id)
-            
-            # Get transcript with better error handling
-            transcript_language = "hi" if language == "hindi" else "en"
-            try:
-                transcript = await self.get_transcript(video_id, transcript_language)
-            except Exception as transcript_error:
-                # Only modify specific "no captions" errors, let other errors pass through
-                error_msg = str(transcript_error)
-                if "captions/transcripts available" in error_msg:
-                    raise Exception("This video doesn't have captions/transcripts available. Please try a different video that has captions enabled, or use the Text or URL input options instead.")
-                elif "unavailable or private" in error_msg:
-                    raise Exception("This video is unavailable or private. Please try a different video.")
-                elif "quota exceeded" in error_msg:
-                    raise Exception("YouTube API quota exceeded. Please try again later.")
-                else:
-                    # For other errors, try to get transcript in any available language
-                    try:
-                        print(f"Trying to get transcript in any available language...")
-                        transcript = await self.get_transcript(video_id, "en")  # Try English as fallback
-                    except Exception as fallback_error:
-                        print(f"Fallback also failed: {fallback_error}")
-                        # If fallback also fails, re-raise the original error
-                        raise transcript_error
-            
-            if not transcript.strip():
-                raise Exception("No transcript available for this video. Please try a different video that has captions enabled.")
-            
-            # Import summarizer service
-            from src.core.summarizer import SummarizerService
-            summarizer = SummarizerService()
-            
-            # Summarize the transcript
-            result = await summarizer.summarize_text(
-                text=transcript,
-                language=language,
-                summary_length=summary_length
-            )
-            
-            # Add video information to result
-            result["title"] = video_info["title"]
-            result["video_id"] = video_id
-            result["video_url"] = video_info["url"]
-            
-            return result
+            # Concurrent requests for the same video and options await one shared task
+            key = flight_key(video_id, language, summary_length, scorer, method, quality, max_words, ratio)
+            return await self.flights.do(key, lambda: self._summarize_video(
+                video_id, language, summary_length, scorer, method, quality, max_words, ratio
+            ))
             
         except Exception as e:
             # Don't wrap the error message again if it's already user-friendly
@@ -232,6 +207,67 @@ class YouTubeProcessor:
                 # For other errors, provide a more generic message but don't hide the original error
                 raise Exception(f"Failed to process YouTube video: {error_msg}")
     
+    async def _summarize_video(
+        self,
+        video_id: str,
+        language: Literal["hindi", "english"],
+        summary_length: Literal["short", "medium", "long", "auto"],
+        scorer: Literal["heuristic", "semantic"],
+        method: Literal["extractive", "abstractive"],
+        quality: Literal["fast", "quality"],
+        max_words: Optional[int],
+        ratio: Optional[float]
+    ) -> Dict[str, Any]:
+        """Fetch the transcript and summarize one video (shared by coalesced requests)"""
+        # Get video info
+        video_info = await self.get_video_info(video_id)
+        
+        # Prefer captions in the requested language; any other track is detected downstream
+        transcript_language = "hi" if language == "hindi" else "en"
+        try:
+            transcript = await self.get_transcript(video_id, transcript_language)
+        except Exception as transcript_error:
+            # Only modify specific "no captions" errors, let other errors pass through
+            error_msg = str(transcript_error)
+            if "captions/transcripts available" in error_msg:
+                raise Exception("This video doesn't have captions/transcripts available. Please try a different video that has captions enabled, or use the Text or URL input options instead.")
+            elif "unavailable or private" in error_msg:
+                raise Exception("This video is unavailable or private. Please try a different video.")
+            elif "quota exceeded" in error_msg:
+                raise Exception("YouTube API quota exceeded. Please try again later.")
+            else:
+                # get_transcript already falls back to any available track, so fetching
+                # again cannot help; the summarizer detects the transcript's actual language
+                raise
+        
+        if not transcript.strip():
+            raise Exception("No transcript available for this video. Please try a different video that has captions enabled.")
+        
+        # Import summarizer service
+        if self.summarizer is None:
+            from src.core.summarizer import SummarizerService
+            self.summarizer = SummarizerService()
+        
+        # Summarize the transcript; the video ID identifies it across re-fetches
+        result = await self.summarizer.summarize_text(
+            text=transcript,
+            language=language,
+            summary_length=summary_length,
+            document_key=f"youtube:{video_id}",
+            scorer=scorer,
+            method=method,
+            quality=quality,
+            max_words=max_words,
+            ratio=ratio
+        )
+        
+        # Add video information to result
+        result["title"] = video_info["title"]
+        result["video_id"] = video_id
+        result["video_url"] = video_info["url"]
+        
+        return result
+    
     def is_valid_youtube_url(self, url: str) -> bool:
         """Check if URL is a valid YouTube URL"""
         try:
@@ -0,0 +1,70 @@
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import SummaryResponse, app, summarizer_service, youtube_processor
+
+ARTICLE = " ".join(
+    f"Sentence number {i} reports a distinct fact about the city council budget and its schools."
+    for i in range(40)
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def assert_matches_response_model(response):
+    """The handlers bypass response_model validation, so check the real payload against it"""
+    assert response.status_code == 200, response.text
+    payload = response.json()
+    SummaryResponse.model_validate(payload)
+    assert set(payload) <= set(SummaryResponse.model_fields), set(payload) - set(SummaryResponse.model_fields)
+    return payload
+
+
+def test_text_endpoint(client):
+    assert_matches_response_model(client.post("/api/summarize/text", json={
+        "text": ARTICLE, "language": "english", "document_id": "api-text"
+    }))
+
+
+def test_text_endpoint_near_duplicate(client):
+    client.post("/api/summarize/text", json={"text": ARTICLE + " One more.", "language": "english"})
+    payload = assert_matches_response_model(client.post("/api/summarize/text", json={
+        "text": ARTICLE + " One more!", "language": "english"
+    }))
+    assert "near_duplicate_of" in payload
+
+
+def test_url_endpoint(client, monkeypatch):
+    monkeypatch.setattr(summarizer_service, "_fetch_article", lambda url, language: (ARTICLE, "Council budget"))
+    payload = assert_matches_response_model(client.post("/api/summarize/url", json={
+        "url": "https://example.com/council", "language": "english"
+    }))
+    assert payload["url"] == "https://example.com/council"
+
+
+def test_pdf_endpoint(client, tmp_path):
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(50, 50, 550, 800), ARTICLE, fontsize=9)
+    pdf_path = tmp_path / "council.pdf"
+    doc.save(pdf_path)
+
+    with open(pdf_path, "rb") as f:
+        payload = assert_matches_response_model(client.post(
+            "/api/summarize/pdf",
+            files={"file": ("council.pdf", f, "application/pdf")},
+            data={"language": "english"}
+        ))
+    assert payload["filename"] == "council.pdf"
+
+
+def test_youtube_endpoint(client, monkeypatch):
+    monkeypatch.setattr(youtube_processor, "_fetch_transcript", lambda video_id, language: ARTICLE)
+    payload = assert_matches_response_model(client.post("/api/summarize/youtube", json={
+        "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "language": "english"
+    }))
+    assert payload["video_id"] == "dQw4w9WgXcQ"
@@ -0,0 +1,31 @@
+from src.core.language import analyze_text, normalize_text, split_sentences
+
+
+def test_short_devanagari_input_keeps_devanagari_script():
+    profile = analyze_text("क़लम ज़रूर")
+
+    assert profile.language == "unknown"
+    assert profile.script == "devanagari"
+
+
+def test_short_latin_input_is_latin():
+    profile = analyze_text("hi there")
+
+    assert profile.language == "unknown"
+    assert profile.script == "latin"
+
+
+def test_detects_hindi_and_english():
+    assert analyze_text("भारत एक विशाल देश है। यहाँ अनेक भाषाएँ बोली जाती हैं।").language == "hindi"
+    assert analyze_text("The government announced a new policy on Monday for the schools.").language == "english"
+
+
+def test_normalizes_danda_variants_and_zero_width_characters():
+    assert normalize_text("देश है | भाषाएँ‍ हैं ||") == "देश है। भाषाएँ हैं॥"
+
+
+def test_decimal_points_do_not_split_sentences():
+    assert split_sentences("It will cost 2.5 billion dollars. Critics said it was rushed.") == [
+        "It will cost 2.5 billion dollars",
+        "Critics said it was rushed",
+    ]
@@ -0,0 +1,37 @@
+from src.core.length_planner import plan_budget, select_sentences
+
+
+def test_max_words_caps_preset_and_ratio_targets():
+    assert plan_budget(1000, "long", max_words=30).target_words == 30
+    assert plan_budget(1000, ratio=0.5, max_words=30).target_words == 30
+    assert plan_budget(1000, ratio=0.1).target_words == 100
+
+
+def test_target_never_exceeds_the_document():
+    assert plan_budget(12, max_words=50).target_words == 12
+
+
+def test_selection_stays_within_the_budget():
+    word_counts = [12, 8, 5, 20, 9]
+    values = [0.9, 0.5, 0.4, 1.0, 0.3]
+
+    selected = select_sentences(word_counts, values, 22)
+
+    assert sum(word_counts[i] for i in selected) <= 22
+    assert selected == sorted(selected)
+
+
+def test_no_sentence_fits_a_tiny_budget():
+    assert select_sentences([12, 15], [1.0, 0.5], 5) == []
+
+
+def test_large_budgets_are_filled_beyond_the_minimum_candidate_pool():
+    # 300 sentences of 14 words; ratio 0.5 asks for 2100 words
+    word_counts = [14] * 300
+    values = [1.0 / (1 + i) for i in range(300)]
+    budget = plan_budget(sum(word_counts), ratio=0.5)
+
+    selected = select_sentences(word_counts, values, budget.target_words)
+
+    assert budget.target_words == 2100
+    assert sum(word_counts[i] for i in selected) == 2100
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from src.core.model_registry import LoadedModel, ModelRegistry, ModelSpec, ModelUnavailable
+
+MODELS = {
+    ("english", "fast"): ModelSpec("english-model", estimated_mb=100),
+    ("hindi", "fast"): ModelSpec("broken-model", estimated_mb=100),
+}
+
+
+class FailingRegistry(ModelRegistry):
+    attempts = 0
+
+    def _load_sync(self, model_id):
+        self.attempts += 1
+        raise OSError("tokenizer files missing")
+
+
+def test_failed_load_is_not_retried_during_cooldown():
+    registry = FailingRegistry(models=MODELS, retry_after_seconds=60)
+
+    async def request():
+        with pytest.raises((OSError, ModelUnavailable)):
+            await registry.get("hindi")
+
+    async def main():
+        for _ in range(3):
+            await request()
+
+    asyncio.run(main())
+
+    assert registry.attempts == 1
+    assert registry.load_failures == 1
+    assert registry.stats()["failed"] == ["broken-model"]
+
+
+def test_failed_load_does_not_evict_loaded_models():
+    registry = FailingRegistry(models=MODELS, max_memory_mb=1, retry_after_seconds=60)
+    registry._loaded["english-model"] = LoadedModel(MODELS[("english", "fast")], None, None, 512 * 1024)
+
+    async def main():
+        with pytest.raises(OSError):
+            await registry.get("hindi")
+
+    asyncio.run(main())
+
+    assert list(registry._loaded) == ["english-model"]
+    assert registry.evictions == 0
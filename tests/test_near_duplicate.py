@@ -0,0 +1,46 @@
+from src.core.near_duplicate import MinHashLSHIndex
+
+ARTICLE = " ".join(f"word{i % 700} token{i % 311}" for i in range(3000))
+
+
+def test_near_identical_text_matches():
+    index = MinHashLSHIndex()
+    index.insert("a", index.signature(ARTICLE), {"id": "a"})
+
+    match = index.query(index.signature(ARTICLE + " one more trailing sentence"))
+
+    assert match is not None
+    assert match[0] == "a"
+    assert match[1] >= index.threshold
+
+
+def test_reinserting_a_key_replaces_its_slot():
+    index = MinHashLSHIndex()
+    for revision in range(5):
+        index.insert("https://x/a", index.signature(f"{ARTICLE} revision {revision}"), {"revision": revision})
+
+    assert len(index) == 1
+    assert index.stats()["documents"] == 1
+    assert index.query(index.signature(f"{ARTICLE} revision 4"))[2] == {"revision": 4}
+
+
+def test_capacity_evicts_oldest_key():
+    index = MinHashLSHIndex(capacity=2)
+    for key in ("a", "b", "c"):
+        index.insert(key, index.signature(f"{key} " * 20), {})
+
+    assert len(index) == 2
+    assert "a" not in index._slot_of
+    assert index.evictions == 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = MinHashLSHIndex()
+    index.insert("a", index.signature(ARTICLE), {"id": "a"})
+    path = tmp_path / "index.bin"
+    index.save(str(path))
+
+    loaded = MinHashLSHIndex.load(str(path))
+
+    assert len(loaded) == 1
+    assert loaded.query(loaded.signature(ARTICLE))[0] == "a"
@@ -0,0 +1,23 @@
+from src.core.profiling import Profiler
+
+
+def test_authorized_accepts_only_the_configured_token():
+    profiler = Profiler(admin_token="secret")
+
+    assert profiler.authorized("secret")
+    assert not profiler.authorized("wrong")
+    assert not profiler.authorized(None)
+
+
+def test_authorized_rejects_non_ascii_tokens_without_raising():
+    profiler = Profiler(admin_token="secret")
+
+    # Starlette decodes header bytes >= 0x80 as latin-1
+    assert not profiler.authorized("s\xe9cret")
+
+
+def test_disabled_without_a_token():
+    profiler = Profiler(admin_token="")
+
+    assert not profiler.enabled
+    assert not profiler.authorized("")
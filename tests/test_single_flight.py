@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from src.core.single_flight import SingleFlight
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_concurrent_calls_share_one_task():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"summary": "ok"}
+
+        results = await asyncio.gather(*[flights.do("k", work) for _ in range(10)])
+        return flights, calls, results
+
+    flights, calls, results = run(scenario())
+
+    assert len(calls) == 1
+    assert all(result == {"summary": "ok"} for result in results)
+    # Each caller gets its own copy to annotate
+    assert results[0] is not results[1]
+    assert flights.stats()["coalesced"] == 9
+    assert len(flights) == 0
+
+
+def test_failure_is_shared_but_not_reused():
+    async def scenario():
+        flights = SingleFlight()
+        attempts = []
+
+        async def work():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise ValueError("download failed")
+            return "ok"
+
+        failures = await asyncio.gather(*[flights.do("k", work) for _ in range(3)], return_exceptions=True)
+        retry = await flights.do("k", work)
+        return flights, failures, retry
+
+    flights, failures, retry = run(scenario())
+
+    assert all(isinstance(failure, ValueError) for failure in failures)
+    assert retry == "ok"
+    assert flights.stats()["failed"] == 1
+
+
+def test_one_waiter_cancelling_does_not_cancel_the_others():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        first = asyncio.ensure_future(flights.do("k", work))
+        second = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert run(scenario()) == "ok"
+
+
+def test_request_after_last_waiter_cancels_starts_fresh():
+    async def scenario():
+        flights = SingleFlight()
+        started = []
+
+        async def work():
+            started.append(1)
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        abandoned = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+
+        # Joins before the cancelled task's done-callback has run
+        late = await flights.do("k", work)
+        return flights, started, late
+
+    flights, started, late = run(scenario())
+
+    assert late == "ok"
+    assert len(started) == 2
+    assert flights.stats()["abandoned"] == 1
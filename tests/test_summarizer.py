@@ -0,0 +1,55 @@
+import asyncio
+import random
+
+from src.core.length_planner import plan_budget
+from src.core.summarizer import SummarizerService
+
+random.seed(3)
+WORDS = [f"w{random.randrange(2000)}" for _ in range(385)]
+ARTICLE = ". ".join(" ".join(WORDS[i:i + 11]) for i in range(0, len(WORDS), 11)) + "."
+BYLINE = "Reported by the staff correspondent for the national daily news wire. "
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_syndicated_copy_matches_despite_a_different_derived_target():
+    service = SummarizerService()
+    original = run(service.summarize_text(ARTICLE, "english"))
+    copy = run(service.summarize_text(BYLINE + ARTICLE, "english"))
+
+    assert plan_budget(len((BYLINE + ARTICLE).split())).target_words != original["target_words"]
+    assert copy["near_duplicate_of"].startswith("sha:")
+    assert copy["similarity"] >= service.near_duplicates.threshold
+
+
+def test_near_duplicates_do_not_match_across_requested_sizes():
+    service = SummarizerService()
+    run(service.summarize_text(ARTICLE, "english", max_words=40))
+    other = run(service.summarize_text(BYLINE + ARTICLE, "english", max_words=60))
+
+    assert "near_duplicate_of" not in other
+
+
+def test_extractive_fallback_is_not_stored_as_abstractive():
+    service = SummarizerService()
+
+    async def unavailable(language, tier="fast"):
+        raise OSError("model files missing")
+
+    service.model_registry.get = unavailable
+    fallback = run(service.summarize_text(ARTICLE, "english", method="abstractive", document_key="doc"))
+
+    assert fallback["method"] == "extractive"
+    assert len(service.near_duplicates) == 0
+    assert service.document_index.get("doc") is None
+
+
+def test_max_words_is_a_hard_cap_when_no_sentence_fits():
+    service = SummarizerService()
+    text = "Every sentence in this short document is much longer than five words. The second one is long as well."
+
+    result = run(service.summarize_text(text, "english", max_words=5))
+
+    assert result["summary_length"] <= 5